@@ -0,0 +1,145 @@
+"""
+Tree Line Lexer Micro-Benchmark
+Compares the old eight-pass str.replace cleanup with tree_lexer
+on generated 100k- and 1M-line tree specs.
+
+Also checks that GNU tree style input (indented with non-breaking
+spaces) parses to the same paths as plain spaces before timing.
+
+Usage:
+    python bench/bench_lexer.py [--lines 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tree_lexer import iter_tree_items, lex_line
+
+
+def legacy_extract_path(line):
+    """The per-line cleanup used before tree_lexer existed."""
+    tree_chars = ['├── ', '├─', '│   ', '│', '└── ', '└─', '   ', '  ']
+    
+    cleaned = line
+    for char in tree_chars:
+        cleaned = cleaned.replace(char, '')
+    
+    cleaned = cleaned.strip()
+    
+    if cleaned:
+        return cleaned
+    return None
+
+
+def generate_tree_lines(count, fanout=8, max_depth=6):
+    """
+    Generate a synthetic tree spec in ├── / │ format.
+    
+    Args:
+        count (int): Number of lines to produce
+        fanout (int): Children per folder
+        max_depth (int): Deepest folder level
+    
+    Returns:
+        list: Tree lines (without newlines)
+    """
+    lines = ["Root/"]
+    depth = 1
+    index = 0
+    
+    while len(lines) < count:
+        index += 1
+        is_last = index % fanout == 0
+        connector = "└── " if is_last else "├── "
+        prefix = "│   " * (depth - 1)
+        
+        if depth < max_depth and index % 3 == 0:
+            lines.append(f"{prefix}{connector}folder_{index}/")
+            depth += 1
+        else:
+            lines.append(f"{prefix}{connector}file_{index}.txt")
+            if is_last and depth > 1:
+                depth -= 1
+    
+    return lines
+
+
+# GNU tree output, which indents with non-breaking spaces
+NBSP_TREE = [
+    "Proj/",
+    "├──\xa0src/",
+    "│\xa0\xa0 ├──\xa0main.py",
+    "│\xa0\xa0 └──\xa0util.py",
+    "└──\xa0README.md",
+]
+
+NBSP_TREE_PATHS = [
+    ("Proj", True),
+    ("Proj/src", True),
+    ("Proj/src/main.py", False),
+    ("Proj/src/util.py", False),
+    ("Proj/README.md", False),
+]
+
+
+def check_nbsp_tree():
+    """Fail loudly if non-breaking space indentation is mis-parsed."""
+    paths = list(iter_tree_items(NBSP_TREE))
+    if paths != NBSP_TREE_PATHS:
+        raise SystemExit(f"✗ NBSP tree parsed as {paths}")
+    print("✓ NBSP-indented tree parses correctly")
+
+
+def measure(label, func, lines):
+    """Run func over lines and return lines per second."""
+    start = time.perf_counter()
+    func(lines)
+    elapsed = time.perf_counter() - start
+    rate = len(lines) / elapsed if elapsed else float('inf')
+    print(f"  {label:<32} {rate:>14,.0f} lines/s  ({elapsed:.2f}s)")
+    return rate
+
+
+def run_legacy(lines):
+    for line in lines:
+        legacy_extract_path(line)
+
+
+def run_lex_line(lines):
+    for line in lines:
+        lex_line(line)
+
+
+def run_iter_tree_items(lines):
+    for _ in iter_tree_items(lines):
+        pass
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark tree line lexing")
+    parser.add_argument("--lines", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="Tree sizes to generate (default: 100000 1000000)")
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("Tree Line Lexer Benchmark")
+    print("=" * 70)
+    check_nbsp_tree()
+    
+    for count in args.lines:
+        lines = generate_tree_lines(count)
+        print(f"\n{count:,} lines:")
+        before = measure("before: 8x str.replace", run_legacy, lines)
+        after = measure("after:  lex_line", run_lex_line, lines)
+        measure("after:  lex_line (NBSP indent)", run_lex_line, [line.replace(' ', '\xa0') for line in lines])
+        measure("after:  iter_tree_items (paths)", run_iter_tree_items, lines)
+        print(f"  speedup (lexing only): {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Structure Materializer Syscall Benchmark
+Counts the filesystem calls made by the old recursive create_structure
+and by structure_writer.materialize on a generated tree.
+
+Usage:
+    python bench/bench_materialize.py [--files 100000] [--target /dev/shm]
+"""
+
+import argparse
+import builtins
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import generate_tree_lines
+from bench_tree_memory import legacy_hierarchy
+from structure_writer import materialize
+from tree_lexer import iter_tree_items
+from tree_model import CompactTree
+
+
+def legacy_create_structure(structure, base_path):
+    """The recursive create_structure used before structure_writer existed."""
+    created_count = 0
+    
+    def process_dict(d, current_path):
+        nonlocal created_count
+        
+        for key, value in d.items():
+            item_path = os.path.join(current_path, key)
+            
+            if value['_is_folder']:
+                os.makedirs(item_path, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(item_path), exist_ok=True)
+                with open(item_path, 'w', encoding='utf-8') as f:
+                    f.write(f"File: {key}\nCreated from tree structure.\n")
+            created_count += 1
+            
+            if value['_children']:
+                process_dict(value['_children'], item_path)
+    
+    os.makedirs(base_path, exist_ok=True)
+    process_dict(legacy_hierarchy(structure), base_path)
+    return created_count
+
+
+def compact_create_structure(structure, base_path):
+    """Materialize through CompactTree and structure_writer."""
+    tree = CompactTree()
+    for path, is_folder in structure:
+        tree.add_path(path, is_folder)
+    created_items, _, _ = materialize(base_path, tree.freeze().iter_paths())
+    return len(created_items)
+
+
+class SyscallCounter:
+    """Count stat / mkdir / open calls while active."""
+    
+    def __init__(self):
+        """Initialize the counter."""
+        self.counts = {'stat': 0, 'mkdir': 0, 'open': 0}
+        self._originals = {}
+    
+    def __enter__(self):
+        self._originals = {'stat': os.stat, 'mkdir': os.mkdir, 'open': builtins.open}
+        os.stat = self._wrap('stat', os.stat)
+        os.mkdir = self._wrap('mkdir', os.mkdir)
+        builtins.open = self._wrap('open', builtins.open)
+        return self
+    
+    def __exit__(self, *exc):
+        os.stat = self._originals['stat']
+        os.mkdir = self._originals['mkdir']
+        builtins.open = self._originals['open']
+        return False
+    
+    def _wrap(self, name, func):
+        counts = self.counts
+        
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return func(*args, **kwargs)
+        
+        return wrapper
+
+
+def run(label, func, structure, target):
+    """Run one materializer in a fresh directory and print its counts."""
+    base = tempfile.mkdtemp(prefix="bench_materialize_", dir=target)
+    try:
+        with SyscallCounter() as counter:
+            start = time.perf_counter()
+            created = func(structure, os.path.join(base, "out"))
+            elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+    
+    counts = counter.counts
+    total = sum(counts.values())
+    print(f"  {label:<28} stat={counts['stat']:>8,} mkdir={counts['mkdir']:>7,} "
+          f"open={counts['open']:>8,} total={total:>9,}  "
+          f"{created / elapsed:>10,.0f} items/s")
+    return total
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Count materializer syscalls")
+    parser.add_argument("--files", type=int, default=100_000,
+                        help="Tree lines to generate (default: 100000)")
+    parser.add_argument("--target", default="/dev/shm" if os.path.isdir("/dev/shm") else None,
+                        help="Directory to generate into (default: /dev/shm when available)")
+    args = parser.parse_args()
+    
+    structure = list(iter_tree_items(generate_tree_lines(args.files)))
+    
+    print("=" * 70)
+    print(f"Structure Materializer Benchmark ({len(structure):,} items)")
+    print("=" * 70)
+    
+    before = run("before: recursive makedirs", legacy_create_structure, structure, args.target)
+    after = run("after:  materialize", compact_create_structure, structure, args.target)
+    print(f"  syscall reduction: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Tree Hierarchy Memory Benchmark
+Reports bytes per node for the old nested-dict hierarchy and CompactTree.
+
+Usage:
+    python bench/bench_tree_memory.py [--nodes 100000 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import generate_tree_lines
+from tree_lexer import iter_tree_items
+from tree_model import CompactTree
+
+
+def legacy_hierarchy(structure):
+    """The nested-dict hierarchy built before CompactTree existed."""
+    hierarchy = {}
+    
+    for path, is_folder in structure:
+        parts = path.split('/')
+        current = hierarchy
+        
+        for i, part in enumerate(parts):
+            if part not in current:
+                current[part] = {
+                    '_is_folder': is_folder or (i < len(parts) - 1),
+                    '_children': {}
+                }
+            current = current[part]['_children']
+    
+    return hierarchy
+
+
+def compact_hierarchy(structure, freeze=True):
+    """Build a CompactTree from (path, is_folder) tuples."""
+    tree = CompactTree()
+    for path, is_folder in structure:
+        tree.add_path(path, is_folder)
+    return tree.freeze() if freeze else tree
+
+
+def measure(label, builder, structure):
+    """
+    Build a hierarchy under tracemalloc and report bytes per node.
+    
+    Returns:
+        float: Bytes per node retained by the built hierarchy
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = builder(structure)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    nodes = len(structure)
+    per_node = retained / nodes
+    print(f"  {label:<28} {per_node:>8.1f} B/node retained  "
+          f"{peak / nodes:>8.1f} B/node peak  ({elapsed:.2f}s)")
+    
+    del result
+    return per_node
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark hierarchy memory use")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="Tree sizes to generate (default: 100000 1000000)")
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("Tree Hierarchy Memory Benchmark")
+    print("=" * 70)
+    
+    for count in args.nodes:
+        structure = list(iter_tree_items(generate_tree_lines(count)))
+        print(f"\n{count:,} nodes:")
+        before = measure("before: nested dicts", legacy_hierarchy, structure)
+        measure("after:  CompactTree (build)",
+                lambda items: compact_hierarchy(items, freeze=False), structure)
+        after = measure("after:  CompactTree (frozen)", compact_hierarchy, structure)
+        print(f"  reduction: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+End-to-End Benchmark Suite
+Runs every generator and scanner stage on synthetic inputs at several
+scales and writes throughput and peak RSS to a JSON file.
+
+Each (stage, scale) pair runs in its own subprocess so that peak RSS
+belongs to that stage alone. Outputs go to a scratch folder on tmpfs
+(/dev/shm when available) and are removed afterwards.
+
+Usage:
+    python bench/run_suite.py [--scales 1000 100000 1000000]
+                              [--stages parse_tree create_structure ...]
+                              [--output bench_results.json]
+                              [--compare previous_results.json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_lexer import generate_tree_lines
+
+
+DEFAULT_SCALES = [1_000, 100_000, 1_000_000]
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def excel_dataframe(rows):
+    """Build a Department / Year / Document Type frame with unique leaves."""
+    import pandas as pd
+    
+    index = pd.RangeIndex(rows)
+    return pd.DataFrame({
+        'Department': "Dept_" + (index % 50).astype(str),
+        'Year': 2000 + index % 25,
+        'Document Type': "Doc_" + index.astype(str),
+    })
+
+
+def write_tree(lines, base_path):
+    """Materialize generated tree lines under base_path."""
+    from structure_writer import materialize
+    from tree_lexer import iter_tree_items
+    
+    materialize(base_path, iter_tree_items(lines))
+
+
+# Each stage has a setup (not timed) returning the state that run
+# receives, and a run returning the number of units processed.
+
+def setup_parse_tree(scale, work_dir):
+    return '\n'.join(generate_tree_lines(scale))
+
+
+def run_parse_tree(text, work_dir):
+    from tree_structure_core import TreeStructureParser
+    return len(TreeStructureParser().parse_tree(text))
+
+
+def setup_create_structure(scale, work_dir):
+    from tree_structure_core import TreeStructureParser
+    parser = TreeStructureParser()
+    parser.parse_tree('\n'.join(generate_tree_lines(scale)))
+    return parser
+
+
+def run_create_structure(parser, work_dir):
+    created_count, _ = parser.create_structure(os.path.join(work_dir, "out"))
+    return created_count
+
+
+def setup_excel(scale, work_dir):
+    from excel_to_structure import ExcelToStructure
+    generator = ExcelToStructure()
+    generator.dataframe = excel_dataframe(scale)
+    return generator
+
+
+def created_count(result):
+    """
+    Return how many items a generation result created.
+    
+    The Excel tools print errors instead of raising, and their output is
+    discarded here, so a failed run has to be turned into an exception or
+    it would be reported as a fast success.
+    """
+    if result is None:
+        raise RuntimeError("generation failed (see the tool's output)")
+    created_items, errors = result[0], result[1]
+    if errors:
+        raise RuntimeError(f"{len(errors)} items failed, e.g. {errors[0]}")
+    if not created_items:
+        raise RuntimeError("nothing was created")
+    return len(created_items)
+
+
+def run_excel_nested(generator, work_dir):
+    return created_count(generator.create_nested_structure(os.path.join(work_dir, "out")))
+
+
+def run_excel_folder_only(generator, work_dir):
+    return created_count(generator.create_folder_only_structure(os.path.join(work_dir, "out")))
+
+
+def setup_excel_stream(scale, work_dir):
+    from openpyxl import Workbook
+    
+    path = os.path.join(work_dir, "inventory.xlsx")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    frame = excel_dataframe(scale)
+    sheet.append(list(frame.columns))
+    for row in frame.itertuples(index=False):
+        sheet.append(list(row))
+    workbook.save(path)
+    return path
+
+
+def run_excel_stream(path, work_dir):
+    from excel_to_structure import ExcelToStructure
+    result = ExcelToStructure().stream_structure(path, os.path.join(work_dir, "out"))
+    created_count(result)
+    return result[3]
+
+
+def setup_folder_to_tree(scale, work_dir):
+    root = os.path.join(work_dir, "scan")
+    write_tree(generate_tree_lines(scale), root)
+    return root
+
+
+def run_folder_to_tree(root, work_dir):
+    from folder_to_tree_visualizer import FolderToTree
+    return FolderToTree().generate_tree(root).count('\n')
+
+
+def setup_adoc_rename(scale, work_dir):
+    root = os.path.join(work_dir, "adoc")
+    lines = [line.replace('.txt', '.adoc') for line in generate_tree_lines(scale)]
+    write_tree(lines, root)
+    return root
+
+
+def run_adoc_rename(root, work_dir):
+    from adoc_renamer import AdocRenamer
+    renamed_count, _ = AdocRenamer.rename_adoc_files(root, rename_in_place=True)
+    return renamed_count
+
+
+# name -> (setup, run, unit)
+STAGES = {
+    'parse_tree': (setup_parse_tree, run_parse_tree, 'items'),
+    'create_structure': (setup_create_structure, run_create_structure, 'items'),
+    'excel_nested': (setup_excel, run_excel_nested, 'items'),
+    'excel_folder_only': (setup_excel, run_excel_folder_only, 'items'),
+    'excel_stream': (setup_excel_stream, run_excel_stream, 'rows'),
+    'folder_to_tree': (setup_folder_to_tree, run_folder_to_tree, 'lines'),
+    'adoc_rename': (setup_adoc_rename, run_adoc_rename, 'files'),
+}
+
+
+def run_worker(stage, scale, target):
+    """
+    Run one stage in this process and print its result as JSON.
+    
+    The tools print progress for every item; that output is discarded so
+    the terminal does not dominate the timing.
+    """
+    setup, run, unit = STAGES[stage]
+    work_dir = tempfile.mkdtemp(prefix=f"bench_{stage}_", dir=target)
+    result_stream = sys.stdout
+    
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            state = setup(scale, work_dir)
+            setup_rss = peak_rss_kb()
+            start = time.perf_counter()
+            count = run(state, work_dir)
+            elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    json.dump({
+        'units': count,
+        'unit': unit,
+        'seconds': round(elapsed, 4),
+        'throughput': round(count / elapsed, 1) if elapsed else None,
+        'setup_peak_rss_kb': setup_rss,
+        'peak_rss_kb': peak_rss_kb(),
+    }, result_stream)
+    result_stream.write('\n')
+
+
+def run_stage(stage, scale, target, timeout):
+    """Run one stage in a subprocess and return its result dict."""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", stage, str(scale), target]
+    result = {'stage': stage, 'scale': scale}
+    
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        result['status'] = 'timeout'
+        return result
+    
+    if completed.returncode != 0:
+        result['status'] = 'error'
+        result['error'] = completed.stderr.strip().splitlines()[-1:] or ['unknown error']
+        return result
+    
+    result['status'] = 'ok'
+    result.update(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return result
+
+
+def git_revision():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT,
+                                   capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def print_comparison(results, previous_path):
+    """Print throughput ratios against an earlier results file."""
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    
+    before = {(r['stage'], r['scale']): r for r in previous['results'] if r.get('status') == 'ok'}
+    print(f"\nCompared with {previous_path} ({previous.get('revision') or 'unknown revision'}):")
+    
+    for result in results:
+        old = before.get((result['stage'], result['scale']))
+        if result.get('status') != 'ok' or old is None:
+            continue
+        speedup = result['throughput'] / old['throughput'] if old['throughput'] else float('inf')
+        rss = result['peak_rss_kb'] / old['peak_rss_kb'] if old['peak_rss_kb'] else float('inf')
+        marker = "  ⚠ slower" if speedup < 0.9 else ""
+        print(f"  {result['stage']:<20} {result['scale']:>10,}  "
+              f"throughput x{speedup:5.2f}  peak RSS x{rss:5.2f}{marker}")
+
+
+def main():
+    """Main function."""
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        run_worker(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+        return
+    
+    parser = argparse.ArgumentParser(description="Run the end-to-end benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Input sizes to run (default: 1000 100000 1000000)")
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), default=list(STAGES),
+                        help="Stages to run (default: all)")
+    parser.add_argument("--target", default="/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+                        help="Scratch directory, ideally tmpfs (default: /dev/shm when available)")
+    parser.add_argument("--timeout", type=float, default=1800,
+                        help="Seconds before a single stage run is abandoned (default: 1800)")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="JSON file to write (default: bench_results.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("End-to-End Benchmark Suite")
+    print("=" * 70)
+    
+    results = []
+    for stage in args.stages:
+        for scale in args.scales:
+            result = run_stage(stage, scale, args.target, args.timeout)
+            results.append(result)
+            
+            if result['status'] == 'ok':
+                print(f"  {stage:<20} {scale:>10,}  {result['throughput']:>12,.0f} {result['unit']}/s  "
+                      f"{result['seconds']:>8.2f}s  peak RSS {result['peak_rss_kb'] / 1024:>7.1f} MiB")
+            else:
+                print(f"  {stage:<20} {scale:>10,}  {result['status']}: {result.get('error', '')}")
+    
+    report = {
+        'revision': git_revision(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'target': args.target,
+        'results': results,
+    }
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results written to {args.output}")
+    
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Content Templates
+Per-extension placeholder content for generated files
+Templates are compiled once and cached as pre-encoded byte chunks
+"""
+
+import csv
+import io
+import json
+import string
+import zipfile
+
+
+# Fields available in templates: {name} (file name), {stem} (name without
+# extension) and {source} (what the structure was generated from).
+DEFAULT_TEMPLATE = "File: {name}\nCreated from {source}.\n"
+
+# Stand-in for {stem} when content is shared between many files
+SHARED_STEM = "Placeholder"
+
+TEMPLATES = {
+    '.py': '"""\n{stem}\n\nCreated from {source}.\n"""\n',
+    '.md': "# {stem}\n\nCreated from {source}.\n",
+    '.adoc': "= {stem}\n\nCreated from {source}.\n",
+    '.json': '{{\n  "name": {stem},\n  "source": {source}\n}}\n',
+    '.csv': "name,source\n{stem},{source}\n",
+}
+
+
+def _json_value(value):
+    """Render value as a JSON string literal, quotes included."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _csv_field(value):
+    """Render value as one CSV field, quoted only when it needs to be."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='').writerow([value])
+    return buffer.getvalue()
+
+
+# How field values are escaped for formats with their own syntax
+TEMPLATE_ESCAPES = {
+    '.json': _json_value,
+    '.csv': _csv_field,
+}
+
+
+def _empty_xlsx():
+    """Build the bytes of a minimal, valid workbook with one empty sheet."""
+    parts = {
+        '[Content_Types].xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '</Types>'
+        ),
+        '_rels/.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        'xl/workbook.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        ),
+        'xl/_rels/workbook.xml.rels': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>'
+        ),
+        'xl/worksheets/sheet1.xml': (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetData/></worksheet>'
+        ),
+    }
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for part_name, xml in parts.items():
+            # Fixed timestamp keeps the bytes identical between runs
+            info = zipfile.ZipInfo(part_name, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, xml)
+    return buffer.getvalue()
+
+
+# Binary stubs are built on first use; callables are evaluated only once
+BINARY_TEMPLATES = {
+    '.xlsx': _empty_xlsx,
+}
+
+
+class ContentTemplates:
+    """Registry of placeholder templates keyed by file extension."""
+    
+    def __init__(self):
+        """Initialize the registry with the built-in templates."""
+        self._templates = dict(TEMPLATES)
+        self._escapes = dict(TEMPLATE_ESCAPES)
+        self._binary = dict(BINARY_TEMPLATES)
+        self._compiled = {}
+        self._shared = {}
+    
+    def register(self, extension, template, escape=None):
+        """
+        Register or replace the template for an extension.
+        
+        Args:
+            extension (str): Extension including the dot, e.g. '.py'
+            template (str, bytes or callable): Text template using the
+                {name}, {stem} and {source} fields, fixed bytes, or a
+                callable returning fixed bytes
+            escape (callable): Applied to every field value of a text
+                               template, e.g. to quote it for the format
+        """
+        extension = extension.lower()
+        self._templates.pop(extension, None)
+        self._escapes.pop(extension, None)
+        self._binary.pop(extension, None)
+        
+        if isinstance(template, str):
+            self._templates[extension] = template
+            if escape is not None:
+                self._escapes[extension] = escape
+        else:
+            self._binary[extension] = template
+        
+        self._compiled = {key: value for key, value in self._compiled.items() if key[0] != extension}
+        self._shared = {key: value for key, value in self._shared.items() if key[0] != extension}
+    
+    def render(self, name, source="tree structure", per_file=True):
+        """
+        Return the encoded content for a file called name.
+        
+        Args:
+            name (str): File name, used to pick the template
+            source (str): What the structure was generated from
+            per_file (bool): If False, {name} and {stem} are filled with
+                             a generic 'Placeholder' so that every file
+                             with the same extension gets identical bytes
+            
+        Returns:
+            bytes: File content
+        """
+        stem, _, extension = name.rpartition('.')
+        if stem:
+            extension = f".{extension.lower()}"
+        else:
+            stem, extension = name, ''
+        
+        if not per_file:
+            stem = SHARED_STEM
+            name = f"{SHARED_STEM}{extension}"
+        
+        compiled = self._compiled.get((extension, source))
+        if compiled is None:
+            compiled = self._compile(extension, source)
+        
+        if isinstance(compiled, bytes):
+            return compiled
+        
+        chunks, slots, escape = compiled
+        if not per_file:
+            shared = self._shared.get((extension, source))
+            if shared is None:
+                shared = self._shared[(extension, source)] = self._fill(chunks, slots, escape, name, stem)
+            return shared
+        
+        return self._fill(chunks, slots, escape, name, stem)
+    
+    def _fill(self, chunks, slots, escape, name, stem):
+        """Join compiled chunks with name/stem encoded into their slots."""
+        parts = chunks.copy()
+        for position, field in slots:
+            value = name if field == 'name' else stem
+            parts[position] = (escape(value) if escape else value).encode('utf-8')
+        return b''.join(parts)
+    
+    def _compile(self, extension, source):
+        """
+        Compile the template for (extension, source) and cache it.
+        
+        Literal text and {source} are merged into pre-encoded byte chunks,
+        with empty slots left where {name} and {stem} go. Formats with an
+        escape (JSON, CSV) get {source} escaped here and the per-file
+        fields escaped as they are filled. A template with no per-file
+        fields compiles to plain bytes.
+        """
+        binary = self._binary.get(extension)
+        if binary is not None:
+            compiled = binary() if callable(binary) else bytes(binary)
+        else:
+            template = self._templates.get(extension, DEFAULT_TEMPLATE)
+            escape = self._escapes.get(extension) if extension in self._templates else None
+            chunks = []
+            slots = []
+            literal = []
+            
+            for text, field, _, _ in string.Formatter().parse(template):
+                literal.append(text)
+                if field is None:
+                    continue
+                if field == 'source':
+                    literal.append(escape(source) if escape else source)
+                elif field in ('name', 'stem'):
+                    chunks.append(''.join(literal).encode('utf-8'))
+                    slots.append((len(chunks), field))
+                    chunks.append(b'')
+                    literal = []
+                else:
+                    raise ValueError(f"Unknown template field {{{field}}} for {extension or 'default'}")
+            
+            chunks.append(''.join(literal).encode('utf-8'))
+            compiled = (chunks, tuple(slots), escape) if slots else b''.join(chunks)
+        
+        self._compiled[(extension, source)] = compiled
+        return compiled
+
+
+# Registry shared by all generators
+templates = ContentTemplates()
@@ -0,0 +1,579 @@
+"""
+Excel Planner
+Vectorized path construction for Excel-driven structure generation
+Turns a DataFrame into one deduplicated plan that preview, generation
+and export share, without looping over rows in Python
+"""
+
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from structure_writer import GenerationCancelled, Progress, materialize
+from workbook_io import DEFAULT_CHUNK_SIZE, iter_workbook_chunks, sheet_names
+
+
+# folders_only: one nested folder per row from every column
+# file_ext: appended to the file names taken from the last column
+# readme: add a README.md to every planned folder
+# template: PathTemplate laying out the paths (default: all but the
+#           last column as folders, the last column as the file name)
+PlanOptions = namedtuple('PlanOptions', ['folders_only', 'file_ext', 'readme', 'template'])
+PlanOptions.__new__.__defaults__ = (False, '.txt', False, None)
+
+
+# Per-column transforms for path templates; each takes and returns a
+# Series of the column's distinct non-blank values
+TRANSFORMS = {
+    'upper': lambda text, arg: text.str.upper(),
+    'lower': lambda text, arg: text.str.lower(),
+    'title': lambda text, arg: text.str.title(),
+    'slug': lambda text, arg: text.str.lower().str.replace(r'\W+', '-', regex=True).str.strip('-'),
+    'safe': lambda text, arg: text.str.replace(r'[<>:"/\\|?*]', '_', regex=True),
+    'zfill': lambda text, arg: text.str.zfill(int(arg)),
+}
+
+
+def cell_strings(column, transforms=()):
+    """
+    Return a column as stripped strings, with '' for blank cells.
+    
+    Matches the old per-cell str(value).strip() rule: missing values and
+    cells that read 'nan' count as blank.
+    
+    Args:
+        column (pd.Series): DataFrame column of any dtype
+        transforms (tuple): (name, arg) pairs from TRANSFORMS, applied in
+                            order to non-blank values
+    
+    Returns:
+        np.ndarray: Object array of str
+    """
+    # Convert each distinct value once; inventories repeat values a lot
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip().fillna('')
+    text = text.to_numpy(dtype=object)
+    text[text == 'nan'] = ''
+    
+    if transforms:
+        filled = text != ''
+        values = pd.Series(text[filled], dtype=object)
+        for name, arg in transforms:
+            values = TRANSFORMS[name](values, arg)
+        text[filled] = values.to_numpy(dtype=object)
+    return text[codes]
+
+
+def join_parts(columns):
+    """
+    Join per-row path parts with '/', skipping blank parts.
+    
+    Args:
+        columns (list): One or more equal-length object arrays from
+                        cell_strings()
+    
+    Returns:
+        np.ndarray: Object array with one relative path per row
+                    ('' where every part was blank)
+    """
+    path = columns[0]
+    for part in columns[1:]:
+        has_part = part != ''
+        has_path = path != ''
+        joined = np.where(has_path & has_part, path + '/' + part, path)
+        path = np.where(has_part & ~has_path, part, joined)
+    return path
+
+
+def row_paths(dataframe, columns=None):
+    """
+    Compute the folder path of every row from the given columns.
+    
+    Args:
+        dataframe (pd.DataFrame): Source data
+        columns (list): Column names in level order (default: all)
+    
+    Returns:
+        np.ndarray: Object array with one path per row
+    """
+    if columns is None:
+        columns = list(dataframe.columns)
+    if not columns:
+        return np.full(len(dataframe), '', dtype=object)
+    return join_parts([cell_strings(dataframe[col]) for col in columns])
+
+
+def unique_paths(paths):
+    """Drop blank and repeated paths, keeping first-seen order."""
+    paths = pd.unique(paths)
+    return paths[paths != '']
+
+
+class PathTemplate:
+    """
+    Compiled path layout such as '{Department}/{Year}/{Document Type}{ext}'.
+    
+    Each '/'-separated segment is a path level built from literal text
+    and {Column} fields; a field may be followed by transforms, e.g.
+    {Name|slug} or {Month|zfill:2}. {ext} is the file extension from
+    PlanOptions. The last segment names a file unless the template ends
+    with '/', in which case every segment is a folder.
+    
+    A segment whose fields are all blank in a row is skipped for that
+    row, as blank cells are in the default layout. The template is parsed
+    once; evaluate() works on whole columns, so a custom layout costs
+    about the same as the default one.
+    """
+    
+    __slots__ = ('text', 'folders', 'file', 'columns')
+    
+    FIELD = re.compile(r'\{([^{}]*)\}')
+    
+    def __init__(self, text):
+        """
+        Compile a template.
+        
+        Args:
+            text (str): Template text
+        
+        Raises:
+            ValueError: On unbalanced braces, an empty field or an
+                        unknown transform
+        """
+        self.text = text
+        
+        segments = [[]]
+        position = 0
+        for match in self.FIELD.finditer(text):
+            self._add_literal(segments, text[position:match.start()])
+            segments[-1].append(self._parse_field(match.group(1)))
+            position = match.end()
+        self._add_literal(segments, text[position:])
+        
+        file = None if text.endswith('/') else segments[-1]
+        self._set_segments(segments[:-1], file)
+    
+    def _set_segments(self, folders, file):
+        """Store the parsed segments and the columns they read."""
+        self.folders = tuple(tuple(segment) for segment in folders if segment)
+        self.file = None if file is None else tuple(file)
+        
+        columns = []
+        for segment in self.folders + (self.file or (),):
+            for kind, value, _ in segment:
+                if kind == 'field' and value not in columns:
+                    columns.append(value)
+        self.columns = columns
+    
+    @staticmethod
+    def _add_literal(segments, literal):
+        if '{' in literal or '}' in literal:
+            raise ValueError(f"Unbalanced braces in path template near '{literal}'")
+        
+        parts = literal.split('/')
+        for index, part in enumerate(parts):
+            if index:
+                segments.append([])
+            if part:
+                segments[-1].append(('literal', part, ()))
+    
+    @staticmethod
+    def _parse_field(spec):
+        name, *specs = [part.strip() for part in spec.split('|')]
+        if not name:
+            raise ValueError("Empty {} field in path template")
+        if name == 'ext' and not specs:
+            return 'ext', None, ()
+        
+        transforms = []
+        for transform in specs:
+            transform_name, _, arg = transform.partition(':')
+            if transform_name not in TRANSFORMS:
+                raise ValueError(f"Unknown transform '{transform_name}' in path template")
+            if transform_name == 'zfill' and not arg.isdigit():
+                raise ValueError("zfill needs a width in path templates, e.g. {Month|zfill:2}")
+            transforms.append((transform_name, arg or None))
+        return 'field', name, tuple(transforms)
+    
+    @classmethod
+    def from_mapping(cls, mapping):
+        """
+        Build a template from a legacy column mapping.
+        
+        Fields are built from the column labels themselves rather than
+        parsed from text, so any label works, including ones with '|',
+        braces or surrounding spaces, non-string labels and 'ext'.
+        
+        Args:
+            mapping (dict): Column name to folder level (int) or 'file',
+                            e.g. {'Category': 0, 'Subcategory': 1, 'Item': 'file'}
+        
+        Returns:
+            PathTemplate: Folders in level order, then the file column
+        """
+        levels = sorted(
+            ((level, index), column) for index, (column, level) in enumerate(mapping.items())
+            if isinstance(level, int)
+        )
+        folders = [[('field', column, ())] for _, column in levels]
+        text = ''.join(f"{{{column}}}/" for _, column in levels)
+        
+        files = [column for column, level in mapping.items() if level == 'file']
+        file = None
+        if files:
+            file = [('field', files[0], ()), ('ext', None, ())]
+            text += f"{{{files[0]}}}{{ext}}"
+        
+        template = cls.__new__(cls)
+        template.text = text
+        template._set_segments(folders, file)
+        return template
+    
+    def __repr__(self):
+        return f"PathTemplate({self.text!r})"
+    
+    def __eq__(self, other):
+        return isinstance(other, PathTemplate) and (other.folders, other.file) == (self.folders, self.file)
+    
+    def __hash__(self):
+        return hash((self.folders, self.file))
+    
+    def _segment(self, dataframe, segment, file_ext):
+        """Evaluate one segment for every row; '' where its fields are blank."""
+        value = ''
+        filled = None
+        for kind, name, transforms in segment:
+            if kind == 'literal':
+                part = name
+            elif kind == 'ext':
+                part = file_ext
+            else:
+                if name not in dataframe.columns:
+                    raise ValueError(f"Column {name!r} from the path template is not in the data")
+                part = cell_strings(dataframe[name], transforms)
+                filled = part != '' if filled is None else filled | (part != '')
+            value = value + part
+        
+        if filled is None:
+            return np.full(len(dataframe), value, dtype=object)
+        return np.where(filled, value, '').astype(object)
+    
+    def evaluate(self, dataframe, file_ext='.txt'):
+        """
+        Lay out every row of a DataFrame.
+        
+        Args:
+            dataframe (pd.DataFrame): Source data
+            file_ext (str): Value of {ext}
+        
+        Returns:
+            tuple: (folders, names) object arrays with one folder path and
+                   one file name per row; names is None for a folders-only
+                   template and '' where a row has no file
+        """
+        if self.folders:
+            folders = join_parts([self._segment(dataframe, segment, file_ext) for segment in self.folders])
+        else:
+            folders = np.full(len(dataframe), '', dtype=object)
+        
+        names = None if self.file is None else self._segment(dataframe, self.file, file_ext)
+        return folders, names
+
+
+class StructurePlan:
+    """
+    Deduplicated folders and files planned from a DataFrame.
+    
+    Paths are kept as two object arrays; entries() expands them (and the
+    optional READMEs) into structure_writer entries on demand, so a plan
+    stays small however many times it is reused.
+    """
+    
+    __slots__ = ('folders', 'files', 'readme')
+    
+    def __init__(self, folders, files, readme=False):
+        """
+        Initialize the plan.
+        
+        Args:
+            folders (np.ndarray): Unique folder paths
+            files (np.ndarray): Unique file paths
+            readme (bool): Add a README.md to every folder
+        """
+        self.folders = folders
+        self.files = files
+        self.readme = readme
+    
+    def __len__(self):
+        """Number of planned items, READMEs included."""
+        folder_count = len(self.folders)
+        return folder_count * (2 if self.readme else 1) + len(self.files)
+    
+    def entries(self):
+        """
+        Yield the plan as materialize() entries, folders first.
+        
+        Yields:
+            tuple: (path, is_folder) or (path, False, content)
+        """
+        for path in self.folders:
+            yield path, True
+        
+        if self.readme:
+            for path in self.folders:
+                name = path.rpartition('/')[2]
+                yield f"{path}/README.md", False, f"# {name}\n\nCreated from Excel structure.\n".encode('utf-8')
+        
+        for path in self.files:
+            yield path, False
+
+
+def build_plan(dataframe, options=PlanOptions()):
+    """
+    Plan the structure for a DataFrame.
+    
+    With options.template the paths follow that template. Otherwise,
+    with options.folders_only every column is a folder level, and
+    without it all but the last column are folder levels and the last
+    column names a file inside them. Rows with a blank file name only
+    get their folder.
+    
+    Args:
+        dataframe (pd.DataFrame): Source data
+        options (PlanOptions): What to plan
+    
+    Returns:
+        StructurePlan: The deduplicated plan
+    """
+    if options.template is not None:
+        row_folders, names = options.template.evaluate(dataframe, options.file_ext)
+        folders = unique_paths(row_folders)
+        if options.folders_only or names is None:
+            files = np.empty(0, dtype=object)
+        else:
+            has_file = names != ''
+            files = unique_paths(join_parts([row_folders[has_file], names[has_file]]))
+    elif options.folders_only:
+        folders = unique_paths(row_paths(dataframe))
+        files = np.empty(0, dtype=object)
+    else:
+        columns = list(dataframe.columns)
+        row_folders = row_paths(dataframe, columns[:-1])
+        names = cell_strings(dataframe[columns[-1]])
+        
+        has_file = names != ''
+        folders = unique_paths(row_folders)
+        files = unique_paths(join_parts([row_folders[has_file], names[has_file] + options.file_ext]))
+    
+    return StructurePlan(folders, files, options.readme)
+
+
+class PlanCache:
+    """
+    Plans for one DataFrame, each built once per set of options.
+    
+    Preview, generation and export ask the cache instead of planning
+    again. The cache empties itself when handed a different DataFrame;
+    call invalidate() after editing the current one in place.
+    """
+    
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._dataframe = None
+        self._plans = {}
+    
+    def get(self, dataframe, options=PlanOptions()):
+        """
+        Return the plan for dataframe and options, building it if needed.
+        
+        Args:
+            dataframe (pd.DataFrame): Source data
+            options (PlanOptions): What to plan
+        
+        Returns:
+            StructurePlan: The cached plan
+        """
+        if dataframe is not self._dataframe:
+            self._dataframe = dataframe
+            self._plans = {}
+        
+        plan = self._plans.get(options)
+        if plan is None:
+            plan = build_plan(dataframe, options)
+            self._plans[options] = plan
+        return plan
+    
+    def invalidate(self):
+        """Forget every plan, e.g. after a cell was edited."""
+        self._plans = {}
+
+
+def materialize_chunks(base_path, chunks, options=PlanOptions(), source="Excel data", progress=None,
+                       cancel=None, **write_options):
+    """
+    Plan and write a structure chunk by chunk as rows are read.
+    
+    Each chunk is planned on its own and written before the next one is
+    read, so generation starts with the first chunk and only one chunk
+    of rows is in memory at a time. Folders (implied parents included)
+    and files already written by an earlier chunk are dropped from later
+    ones; those sets of known paths are the only state that grows with
+    the output.
+    
+    Args:
+        base_path (str): Folder to create the structure in
+        chunks (iterable): DataFrames, e.g. from workbook_io.iter_workbook_chunks()
+        options (PlanOptions): What to plan
+        source (str): Origin named in the placeholder content
+        progress (callable): Called with a Progress whose done counts
+                             items across all chunks; total and eta are
+                             None because the row count is not known
+                             until the input is exhausted
+        cancel (CancelToken): Checked between items
+        **write_options: workers, overwrite, link_mode or sink for
+                         structure_writer.materialize()
+    
+    Returns:
+        tuple: (created_items, errors, stats, rows) with stats summed
+               over all chunks and rows the number of rows read
+    
+    Raises:
+        GenerationCancelled: If cancel was triggered; created_items and
+                             errors cover every chunk written so far
+    """
+    known_dirs = {''}
+    seen_files = set()
+    created_items = []
+    errors = []
+    stats = {}
+    rows = 0
+    
+    chunk_progress = None
+    if progress is not None:
+        start = time.perf_counter()
+        done_before = 0
+        done_in_chunk = 0
+        
+        def chunk_progress(update):
+            nonlocal done_in_chunk
+            done_in_chunk = update.done
+            done = done_before + update.done
+            elapsed = time.perf_counter() - start
+            progress(Progress(done, None, done / elapsed if elapsed > 0 else 0.0, None))
+    
+    for chunk in chunks:
+        rows += len(chunk)
+        plan = build_plan(chunk, options)
+        plan = StructurePlan(
+            [path for path in plan.folders if path not in known_dirs],
+            [path for path in plan.files if path not in seen_files],
+            plan.readme
+        )
+        seen_files.update(plan.files)
+        
+        try:
+            # materialize() adds this chunk's folders and parents to known_dirs
+            created, failed, chunk_stats = materialize(
+                base_path, plan.entries(), source, progress=chunk_progress, cancel=cancel,
+                known_dirs=known_dirs, **write_options
+            )
+        except GenerationCancelled as e:
+            raise GenerationCancelled(created_items + e.created_items, errors + e.errors, stats) from None
+        
+        if chunk_progress is not None:
+            done_before += done_in_chunk
+            done_in_chunk = 0
+        
+        created_items.extend(created)
+        errors.extend(failed)
+        for key, value in chunk_stats.items():
+            stats[key] = stats.get(key, 0) + value
+    
+    return created_items, errors, stats, rows
+
+
+def plan_sheet(filepath, sheet_name, options=PlanOptions(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Plan one worksheet under a sub-root named after the sheet.
+    
+    Reads the sheet itself, so it can run in a worker process with only
+    the file path passed in.
+    
+    Args:
+        filepath (str): Path to the workbook
+        sheet_name (str): Sheet to plan
+        options (PlanOptions): What to plan
+        chunk_size (int): Rows read per step
+    
+    Returns:
+        tuple: (sheet_name, StructurePlan, rows)
+    """
+    folders = []
+    files = []
+    rows = 0
+    
+    columns = options.template.columns if options.template is not None else None
+    for chunk in iter_workbook_chunks(filepath, sheet_name, chunk_size, columns):
+        if chunk.columns.empty:
+            continue
+        rows += len(chunk)
+        plan = build_plan(chunk, options)
+        folders.append(np.asarray(plan.folders, dtype=object))
+        files.append(np.asarray(plan.files, dtype=object))
+    
+    prefix = f"{sheet_name}/"
+    folders = unique_paths(prefix + np.concatenate(folders)) if folders else np.empty(0, dtype=object)
+    files = unique_paths(prefix + np.concatenate(files)) if files else np.empty(0, dtype=object)
+    return sheet_name, StructurePlan(folders, files, options.readme), rows
+
+
+def plan_workbook(filepath, sheets=None, options=PlanOptions(), workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Plan several sheets in parallel, one process per sheet.
+    
+    Args:
+        filepath (str): Path to the workbook
+        sheets (list): Sheet names to plan (default: all)
+        options (PlanOptions): What to plan
+        workers (int): Planning processes (default: one per sheet, at
+                       most one per CPU)
+        chunk_size (int): Rows read per step
+    
+    Returns:
+        list: (sheet_name, StructurePlan, rows) in sheet order
+    """
+    sheets = list(sheets or sheet_names(filepath))
+    workers = workers or min(len(sheets), os.cpu_count() or 1)
+    
+    if workers <= 1 or len(sheets) <= 1:
+        return [plan_sheet(filepath, sheet, options, chunk_size) for sheet in sheets]
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(plan_sheet, filepath, sheet, options, chunk_size) for sheet in sheets]
+        return [future.result() for future in futures]
+
+
+def merge_plans(plans, readme=False):
+    """
+    Merge per-sheet plans into a single plan for one generation run.
+    
+    Args:
+        plans (iterable): StructurePlan objects with disjoint sub-roots
+        readme (bool): Add a README.md to every folder
+    
+    Returns:
+        StructurePlan: Combined plan
+    """
+    plans = list(plans)
+    folders = [plan.folders for plan in plans]
+    files = [plan.files for plan in plans]
+    return StructurePlan(
+        np.concatenate(folders) if folders else np.empty(0, dtype=object),
+        np.concatenate(files) if files else np.empty(0, dtype=object),
+        readme
+    )
@@ -1,13 +1,29 @@
 """
 Excel File Upload & File Structure Generator
 This script allows you to upload an Excel file and generate a file/folder structure based on it.
+
+Run without arguments for the interactive menu, or stream a large
+workbook (or CSV, TSV or Parquet table) straight into a structure in
+bounded memory:
+
+    python excel_to_structure.py inventory.xlsx --output OUT [--folders-only] [--ext .md]
+    python excel_to_structure.py export.csv --output OUT
+    python excel_to_structure.py inventory.xlsx -o OUT --template "{Department}/{Year}/{Document Type|slug}{ext}"
+    python excel_to_structure.py departments.xlsx -o OUT --all-sheets
 """
 
+import argparse
 import os
 import json
-import pandas as pd
+import sys
 from pathlib import Path
 
+from excel_planner import PathTemplate, PlanCache, PlanOptions, materialize_chunks, merge_plans, plan_workbook
+from output_sinks import archive_format, open_sink
+from structure_writer import GenerationCancelled, format_progress, materialize
+from workbook_cache import WorkbookCache
+from workbook_io import DEFAULT_CHUNK_SIZE, iter_workbook_chunks, read_workbook
+
 
 class ExcelToStructure:
     """Converts Excel data into file and folder structures."""
@@ -17,13 +33,22 @@ class ExcelToStructure:
         self.excel_file = None
         self.dataframe = None
         self.output_base = None
+        self.plans = PlanCache()
+        self.cache = WorkbookCache()
         
-    def load_excel(self, filepath):
+    def load_excel(self, filepath, use_cache=True, columns=None):
         """
-        Load an Excel file.
+        Load an Excel file, or a CSV, TSV or Parquet table.
+        
+        The reader is picked by extension (see workbook_io), and every
+        format gives the same text-only table.
         
         Args:
-            filepath (str): Path to the Excel file (.xlsx, .xls)
+            filepath (str): Path to the file (.xlsx, .xlsm, .xls, .csv,
+                            .tsv or .parquet)
+            use_cache (bool): Reuse the parsed table of an unchanged file
+                              from the workbook cache
+            columns (list): Only read these columns (default: all)
             
         Returns:
             pd.DataFrame: The loaded Excel data
@@ -32,11 +57,14 @@ class ExcelToStructure:
             if not os.path.exists(filepath):
                 raise FileNotFoundError(f"File not found: {filepath}")
             
-            # Load the Excel file
+            # Load the Excel file, every cell as text
             self.excel_file = filepath
-            self.dataframe = pd.read_excel(filepath)
+            if use_cache:
+                self.dataframe, cached = self.cache.read(filepath, columns=columns)
+            else:
+                self.dataframe, cached = read_workbook(filepath, columns=columns), False
             
-            print(f"✓ Successfully loaded Excel file: {filepath}")
+            print(f"✓ Successfully loaded file: {filepath}{' (cached)' if cached else ''}")
             print(f"  Dimensions: {self.dataframe.shape[0]} rows × {self.dataframe.shape[1]} columns")
             print(f"  Columns: {list(self.dataframe.columns)}\n")
             
@@ -64,99 +92,246 @@ class ExcelToStructure:
         print(self.dataframe.head(rows))
         print()
     
-    def create_nested_structure(self, output_base_path, column_mapping=None):
+    def create_nested_structure(self, output_base_path, column_mapping=None, workers=1, link_mode=None,
+                                sink=None, progress=None, cancel=None, file_ext='.txt', template=None):
         """
         Create nested folder/file structure based on DataFrame columns.
         
         Args:
             output_base_path (str): Base path where structure will be created
             column_mapping (dict): Maps column names to folder structure levels
-                                  e.g., {'Category': 0, 'Subcategory': 1, 'Item': 'file'}
+                                  e.g., {'Category': 0, 'Subcategory': 1, 'Item': 'file'};
+                                  ignored when template is given
+            workers (int): Threads used to write files (1 = sequential)
+            link_mode (str): None, 'hardlink' or 'reflink' to store each
+                             distinct placeholder once and link it into place
+            sink (OutputSink): Write into an archive (see output_sinks)
+                               instead of output_base_path
+            progress (callable): Called with a structure_writer.Progress
+                                 as items finish
+            cancel (CancelToken): Stops the run between items
+            file_ext (str): Extension substituted for {ext}
+            template (str or PathTemplate): Path layout such as
+                                            '{Department}/{Year}/{Document Type}{ext}'
+        
+        Returns:
+            tuple: (created_items, errors, stats), or None on error
         """
         if self.dataframe is None:
             print("No data loaded. Please load an Excel file first.")
-            return
+            return None
         
         self.output_base = output_base_path
         
-        # If no mapping provided, use default logic
-        if column_mapping is None:
-            column_mapping = self._auto_detect_mapping()
-        
         try:
-            os.makedirs(output_base_path, exist_ok=True)
+            # If no template provided, lay out the (detected) mapping
+            if template is None:
+                template = PathTemplate.from_mapping(column_mapping or self._auto_detect_mapping())
+            elif isinstance(template, str):
+                template = PathTemplate(template)
+            
             print(f"Creating structure in: {output_base_path}\n")
             
+            plan = self.plans.get(self.dataframe, PlanOptions(file_ext=file_ext, template=template))
+            
+            created_items, errors, stats = materialize(
+                output_base_path, plan.entries(), source="Excel data", workers=workers, link_mode=link_mode,
+                sink=sink, progress=progress, cancel=cancel
+            )
+            
             created_count = 0
+            for item_type, rel_path in created_items:
+                if item_type == 'file':
+                    created_count += 1
+                    print(f"✓ Created: {rel_path}")
             
-            for idx, row in self.dataframe.iterrows():
-                current_path = output_base_path
-                
-                # Iterate through columns (excluding the last one which is typically the file/item)
-                for col in self.dataframe.columns[:-1]:
-                    value = str(row[col]).strip()
-                    
-                    if value and value != 'nan':
-                        current_path = os.path.join(current_path, value)
-                        os.makedirs(current_path, exist_ok=True)
-                
-                # Create final file if last column is specified as file
-                last_col_value = str(row[self.dataframe.columns[-1]]).strip()
-                if last_col_value and last_col_value != 'nan':
-                    file_path = os.path.join(current_path, f"{last_col_value}.txt")
-                    if not os.path.exists(file_path):
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.write(f"File: {last_col_value}\nCreated from Excel data.\n")
-                        created_count += 1
-                        print(f"✓ Created: {os.path.relpath(file_path, output_base_path)}")
+            for rel_path, error in errors:
+                print(f"✗ Error creating {rel_path}: {error}")
             
             print(f"\n✓ Structure created successfully!")
             print(f"  Total files/folders created: {created_count}")
+            return created_items, errors, stats
             
+        except GenerationCancelled as e:
+            print(f"\n⚠ {e}")
         except Exception as e:
             print(f"✗ Error creating structure: {e}")
+        return None
     
-    def create_folder_only_structure(self, output_base_path):
+    def create_folder_only_structure(self, output_base_path, sink=None, progress=None, cancel=None):
         """
         Create only folder structure (no files) based on DataFrame.
         Each row creates a nested folder hierarchy.
         
         Args:
             output_base_path (str): Base path where folders will be created
+            sink (OutputSink): Write into an archive (see output_sinks)
+                               instead of output_base_path
+            progress (callable): Called with a structure_writer.Progress
+                                 as folders are created
+            cancel (CancelToken): Stops the run between folders
+        
+        Returns:
+            tuple: (created_items, errors, stats), or None on error
         """
         if self.dataframe is None:
             print("No data loaded. Please load an Excel file first.")
-            return
+            return None
         
         self.output_base = output_base_path
         
         try:
-            os.makedirs(output_base_path, exist_ok=True)
             print(f"Creating folder structure in: {output_base_path}\n")
             
-            created_count = 0
+            # Nested folder path from all columns of each row
+            plan = self.plans.get(self.dataframe, PlanOptions(folders_only=True))
             
-            for idx, row in self.dataframe.iterrows():
-                current_path = output_base_path
-                
-                # Build nested folder path from all columns
-                for col in self.dataframe.columns:
-                    value = str(row[col]).strip()
-                    
-                    if value and value != 'nan':
-                        current_path = os.path.join(current_path, value)
-                
-                # Create the nested structure
-                if current_path != output_base_path:
-                    os.makedirs(current_path, exist_ok=True)
-                    created_count += 1
-                    print(f"✓ Created: {os.path.relpath(current_path, output_base_path)}")
+            created_items, errors, stats = materialize(
+                output_base_path, plan.entries(), sink=sink, progress=progress, cancel=cancel
+            )
+            
+            for _, rel_path in created_items:
+                print(f"✓ Created: {rel_path}")
+            
+            for rel_path, error in errors:
+                print(f"✗ Error creating {rel_path}: {error}")
             
             print(f"\n✓ Folder structure created successfully!")
-            print(f"  Total folders created: {created_count}")
+            print(f"  Total folders created: {len(created_items)}")
+            return created_items, errors, stats
             
+        except GenerationCancelled as e:
+            print(f"\n⚠ {e}")
         except Exception as e:
             print(f"✗ Error creating folder structure: {e}")
+        return None
+    
+    def stream_structure(self, filepath, output_base_path, folders_only=False, file_ext='.txt',
+                         chunk_size=DEFAULT_CHUNK_SIZE, workers=1, link_mode=None, sink=None,
+                         progress=None, cancel=None, template=None):
+        """
+        Create a structure straight from a workbook without loading it.
+        
+        Rows are read in chunks and each chunk is planned and written
+        before the next is read, so memory use is bounded by chunk_size
+        and the first items appear before the file is fully read.
+        
+        Args:
+            filepath (str): Path to the Excel file
+            output_base_path (str): Base path where structure will be created
+            folders_only (bool): Every column is a folder level (no files)
+            file_ext (str): Extension for the files named by the last column
+            chunk_size (int): Rows read and planned per step
+            workers (int): Threads used to write files (1 = sequential)
+            link_mode (str): None, 'hardlink' or 'reflink'
+            sink (OutputSink): Write into an archive instead of a folder
+            progress (callable): Called with a structure_writer.Progress
+            cancel (CancelToken): Stops the run between items
+            template (str or PathTemplate): Path layout (see
+                                            excel_planner.PathTemplate); only
+                                            its columns are read
+        
+        Returns:
+            tuple: (created_items, errors, stats, rows), or None on error
+        """
+        self.output_base = output_base_path
+        
+        try:
+            if isinstance(template, str):
+                template = PathTemplate(template)
+            options = PlanOptions(folders_only=folders_only, file_ext=file_ext, template=template)
+            
+            print(f"Streaming {filepath} into: {output_base_path}\n")
+            
+            columns = template.columns if template is not None else None
+            chunks = iter_workbook_chunks(filepath, chunk_size=chunk_size, columns=columns)
+            result = materialize_chunks(
+                output_base_path, chunks, options,
+                progress=progress, cancel=cancel, workers=workers, link_mode=link_mode, sink=sink
+            )
+            created_items, errors, _, rows = result
+            
+            for rel_path, error in errors:
+                print(f"✗ Error creating {rel_path}: {error}")
+            
+            print(f"✓ Structure created from {rows} rows")
+            print(f"  Total files/folders created: {len(created_items)}")
+            return result
+            
+        except GenerationCancelled as e:
+            print(f"\n⚠ {e}")
+        except Exception as e:
+            print(f"✗ Error creating structure: {e}")
+        return None
+    
+    def create_workbook_structure(self, filepath, output_base_path, sheets=None, folders_only=False,
+                                  file_ext='.txt', plan_workers=None, workers=1, link_mode=None, sink=None,
+                                  progress=None, cancel=None, template=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Create one sub-root per worksheet from a multi-sheet workbook.
+        
+        Sheets are planned in parallel worker processes; the plans are
+        merged and written in a single run.
+        
+        Args:
+            filepath (str): Path to the Excel file
+            output_base_path (str): Base path where structure will be created
+            sheets (list): Sheet names to include (default: all)
+            folders_only (bool): Every column is a folder level (no files)
+            file_ext (str): Extension for the files named by the last column
+            plan_workers (int): Planning processes (default: one per sheet)
+            workers (int): Threads used to write files (1 = sequential)
+            link_mode (str): None, 'hardlink' or 'reflink'
+            sink (OutputSink): Write into an archive instead of a folder
+            progress (callable): Called with a structure_writer.Progress
+            cancel (CancelToken): Stops the run between items
+            template (str or PathTemplate): Path layout inside each sheet's
+                                            sub-root (see excel_planner.PathTemplate)
+            chunk_size (int): Rows read and planned per step in each sheet
+        
+        Returns:
+            tuple: (created_items, errors, stats), or None on error
+        """
+        self.output_base = output_base_path
+        
+        try:
+            if isinstance(template, str):
+                template = PathTemplate(template)
+            
+            print(f"Planning sheets of {filepath}...")
+            options = PlanOptions(folders_only=folders_only, file_ext=file_ext, template=template)
+            sheet_plans = plan_workbook(filepath, sheets, options, workers=plan_workers, chunk_size=chunk_size)
+            plan = merge_plans([sheet_plan for _, sheet_plan, _ in sheet_plans], options.readme)
+            
+            print(f"Creating structure in: {output_base_path}\n")
+            created_items, errors, stats = materialize(
+                output_base_path, plan.entries(), source="Excel data", workers=workers, link_mode=link_mode,
+                sink=sink, progress=progress, cancel=cancel
+            )
+            
+            # Sub-roots are the first path component (apply_plan paths use os.sep)
+            created_per_sheet = {}
+            for _, rel_path in created_items:
+                root = rel_path.replace(os.sep, '/').split('/', 1)[0]
+                created_per_sheet[root] = created_per_sheet.get(root, 0) + 1
+            
+            print(f"{'Sheet':<30} {'Rows':>10} {'Folders':>10} {'Files':>10} {'Created':>10}")
+            for sheet_name, sheet_plan, rows in sheet_plans:
+                print(f"{sheet_name:<30} {rows:>10} {len(sheet_plan.folders):>10} "
+                      f"{len(sheet_plan.files):>10} {created_per_sheet.get(sheet_name, 0):>10}")
+            
+            for rel_path, error in errors:
+                print(f"✗ Error creating {rel_path}: {error}")
+            
+            print(f"\n✓ Structure created from {len(sheet_plans)} sheets")
+            print(f"  Total files/folders created: {len(created_items)}")
+            return created_items, errors, stats
+            
+        except GenerationCancelled as e:
+            print(f"\n⚠ {e}")
+        except Exception as e:
+            print(f"✗ Error creating structure: {e}")
+        return None
     
     def create_json_structure(self, output_file="structure.json"):
         """
@@ -202,6 +377,10 @@ class ExcelToStructure:
         """
         Auto-detect column mapping based on column names.
         
+        All but the last column are folder levels and the last column
+        names the file, which PathTemplate.from_mapping() turns into
+        '{A}/{B}/{C}{ext}'.
+        
         Returns:
             dict: Mapping of columns to structure levels
         """
@@ -236,8 +415,73 @@ class ExcelToStructure:
         return '\n'.join(tree)
 
 
+def run_cli(argv=None):
+    """
+    Command line entry point for streaming generation.
+    
+    Returns:
+        int: Exit status (0 = success, 1 = failure)
+    """
+    parser = argparse.ArgumentParser(description="Create files and folders from an Excel workbook")
+    parser.add_argument("workbook", help="Excel file (.xlsx, .xlsm or .xls) or CSV, TSV or Parquet table")
+    parser.add_argument("-o", "--output", required=True,
+                        help="Output folder, or a .zip/.tar/.tar.gz archive")
+    parser.add_argument("--folders-only", action="store_true",
+                        help="Use every column as a folder level and create no files")
+    parser.add_argument("--ext", default=".txt",
+                        help="Extension for files named by the last column (default: .txt)")
+    parser.add_argument("--template", metavar="TEMPLATE",
+                        help="Path layout, e.g. '{Department}/{Year|zfill:4}/{Document Type|slug}{ext}' "
+                             "(transforms: upper, lower, title, slug, safe, zfill:N)")
+    parser.add_argument("--sheet", action="append", dest="sheets", metavar="NAME",
+                        help="Sheet to include under its own sub-root (repeatable)")
+    parser.add_argument("--all-sheets", action="store_true",
+                        help="Include every sheet, each under its own sub-root")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows read per step (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Threads used to write files (default: 1)")
+    parser.add_argument("--link-mode", choices=["hardlink", "reflink"],
+                        help="Store each distinct placeholder once and link it into place")
+    parser.add_argument("--progress", action="store_true",
+                        help="Show items/s and ETA on stderr while writing")
+    args = parser.parse_args(argv)
+    
+    def show_progress(progress):
+        print(f"\r  {format_progress(progress)}   ", end="", file=sys.stderr, flush=True)
+    
+    if not os.path.exists(args.workbook):
+        print(f"✗ Error: File not found: {args.workbook}", file=sys.stderr)
+        return 1
+    
+    sink = open_sink(args.output) if archive_format(args.output) else None
+    try:
+        if args.sheets or args.all_sheets:
+            result = ExcelToStructure().create_workbook_structure(
+                args.workbook, args.output, sheets=args.sheets, folders_only=args.folders_only,
+                file_ext=args.ext, workers=max(1, args.workers), link_mode=args.link_mode, sink=sink,
+                progress=show_progress if args.progress else None, template=args.template,
+                chunk_size=max(1, args.chunk_size)
+            )
+        else:
+            result = ExcelToStructure().stream_structure(
+                args.workbook, args.output, folders_only=args.folders_only, file_ext=args.ext,
+                chunk_size=max(1, args.chunk_size), workers=max(1, args.workers), link_mode=args.link_mode,
+                sink=sink, progress=show_progress if args.progress else None, template=args.template
+            )
+    finally:
+        if sink is not None:
+            sink.close()
+        if args.progress:
+            print(file=sys.stderr)
+    
+    return 0 if result is not None and not result[1] else 1
+
+
 def main():
     """Main function demonstrating usage."""
+    if len(sys.argv) > 1:
+        sys.exit(run_cli())
     
     print("=" * 60)
     print("Excel to File Structure Generator")
@@ -251,7 +495,7 @@ def main():
     excel_path = input("Enter the path to your Excel file: ").strip()
     
     # Load the Excel file
-    if generator.load_excel(excel_path):
+    if generator.load_excel(excel_path) is not None:
         
         # Display preview
         generator.display_preview(rows=5)
@@ -267,13 +511,21 @@ def main():
         
         choice = input("Enter your choice (1-5): ").strip()
         
-        if choice == '1':
-            output_path = input("Enter output folder path: ").strip()
-            generator.create_folder_only_structure(output_path)
-        
-        elif choice == '2':
-            output_path = input("Enter output folder path: ").strip()
-            generator.create_nested_structure(output_path)
+        if choice in ('1', '2'):
+            output_path = input("Enter output folder path (or .zip / .tar.gz archive): ").strip()
+            file_ext = '.txt'
+            if choice == '2':
+                file_ext = input("Enter file extension (default: .txt): ").strip() or '.txt'
+            
+            sink = open_sink(output_path) if archive_format(output_path) else None
+            try:
+                if choice == '1':
+                    generator.create_folder_only_structure(output_path, sink=sink)
+                else:
+                    generator.create_nested_structure(output_path, sink=sink, file_ext=file_ext)
+            finally:
+                if sink is not None:
+                    sink.close()
         
         elif choice == '3':
             output_file = input("Enter output JSON file path (default: structure.json): ").strip()
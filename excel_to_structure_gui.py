@@ -13,6 +13,13 @@ from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
 import threading
 
+from excel_planner import PlanCache, PlanOptions
+from gui_support import MAX_WORKERS, LogChannel, ProgressPanel, VirtualGrid, read_workers
+from structure_writer import GenerationCancelled, materialize
+from tree_model import CompactTree
+from workbook_cache import WorkbookCache
+from workbook_io import SUPPORTED_SUFFIXES, sheet_names
+
 
 class ExcelStructureGUI:
     """GUI for Excel to File Structure conversion."""
@@ -29,6 +36,12 @@ class ExcelStructureGUI:
         self.dataframe = None
         self.output_path = None
         
+        # Plans are built once per DataFrame and options
+        self.plans = PlanCache()
+        
+        # Parsed workbooks, reused while the file is unchanged
+        self.workbook_cache = WorkbookCache()
+        
         # Setup GUI
         self.setup_ui()
         
@@ -101,6 +114,10 @@ class ExcelStructureGUI:
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(footer_frame, textvariable=self.status_var, relief="sunken", anchor="w")
         status_bar.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        
+        # Progress of the running generation
+        self.progress_panel = ProgressPanel(main_frame, self.log_channel)
+        self.progress_panel.grid(row=3, column=0, sticky="ew")
     
     def setup_preview_tab(self, parent):
         """Setup the data preview and edit tab."""
@@ -117,9 +134,10 @@ class ExcelStructureGUI:
         vsb = ttk.Scrollbar(tree_frame, orient="vertical")
         hsb = ttk.Scrollbar(tree_frame, orient="horizontal")
         
-        self.tree = ttk.Treeview(tree_frame, yscroll=vsb.set, xscroll=hsb.set)
-        vsb.config(command=self.tree.yview)
+        # Only the rows in view are loaded; the grid drives the vertical scrollbar
+        self.tree = ttk.Treeview(tree_frame, xscroll=hsb.set)
         hsb.config(command=self.tree.xview)
+        self.data_grid = VirtualGrid(self.tree, vsb)
         
         self.tree.grid(row=0, column=0, sticky="nsew")
         vsb.grid(row=0, column=1, sticky="ns")
@@ -177,6 +195,10 @@ class ExcelStructureGUI:
         
         # Store the structure tree for manual building
         self.manual_structure = {}
+        
+        # Source of truth for the structure; the Treeview only shows it
+        # and uses node indexes as item ids
+        self.structure_model = CompactTree()
     
     def setup_options_tab(self, parent):
         """Setup the options tab."""
@@ -210,6 +232,19 @@ class ExcelStructureGUI:
         # Empty folders only
         self.empty_folders = tk.BooleanVar(value=False)
         ttk.Checkbutton(ext_frame, text="Create empty folders (no files)", variable=self.empty_folders).pack(anchor="w", pady=5)
+        
+        # Parallel file writing
+        perf_frame = ttk.LabelFrame(parent, text="Performance", padding="10")
+        perf_frame.grid(row=2, column=0, sticky="ew", padx=5, pady=5)
+        
+        ttk.Label(perf_frame, text="Write Threads (1 = sequential):").pack(anchor="w", pady=5)
+        self.workers_var = tk.StringVar(value="1")
+        ttk.Spinbox(perf_frame, from_=1, to=MAX_WORKERS, textvariable=self.workers_var, width=5).pack(anchor="w", pady=5)
+        
+        ttk.Label(perf_frame, text="Deduplicate identical files (hardlink/reflink from a hidden store):").pack(anchor="w", pady=5)
+        self.link_mode = ttk.Combobox(perf_frame, values=["off", "hardlink", "reflink"], state="readonly")
+        self.link_mode.set("off")
+        self.link_mode.pack(anchor="w", pady=5)
     
     def setup_log_tab(self, parent):
         """Setup the output log tab."""
@@ -218,21 +253,26 @@ class ExcelStructureGUI:
         
         self.log_text = ScrolledText(parent, wrap="word", height=20, width=80)
         self.log_text.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.log_channel = LogChannel(self.root, self.log_text)
         
         # Clear button
-        ttk.Button(parent, text="Clear Log", command=lambda: self.log_text.delete("1.0", "end")).grid(row=1, column=0, sticky="e", padx=5, pady=5)
+        ttk.Button(parent, text="Clear Log", command=lambda: self.log_channel.clear()).grid(row=1, column=0, sticky="e", padx=5, pady=5)
     
     def log(self, message):
-        """Add message to log."""
-        self.log_text.insert("end", message + "\n")
-        self.log_text.see("end")
-        self.root.update()
+        """Add message to log; safe to call from worker threads."""
+        self.log_channel.put(message)
     
     def browse_input_file(self):
-        """Browse for input Excel file."""
+        """Browse for input Excel, CSV, TSV or Parquet file."""
         file_path = filedialog.askopenfilename(
-            title="Select Excel File",
-            filetypes=[("Excel Files", "*.xlsx *.xls"), ("All Files", "*.*")]
+            title="Select Data File",
+            filetypes=[
+                ("Data Files", " ".join(f"*{suffix}" for suffix in SUPPORTED_SUFFIXES)),
+                ("Excel Files", "*.xlsx *.xlsm *.xls"),
+                ("CSV/TSV Files", "*.csv *.tsv *.tab"),
+                ("Parquet Files", "*.parquet *.pq"),
+                ("All Files", "*.*")
+            ]
         )
         if file_path:
             self.excel_file = file_path
@@ -254,10 +294,20 @@ class ExcelStructureGUI:
             return
         
         try:
-            self.dataframe = pd.read_excel(self.excel_file)
+            sheets = sheet_names(self.excel_file)
+            if len(sheets) <= 1 or not messagebox.askyesno(
+                "Multiple Sheets",
+                f"This workbook has {len(sheets)} sheets.\n\n"
+                "Load all of them, each under its own folder?\n"
+                "(No loads only the first sheet.)"
+            ):
+                sheets = None
+            
+            self.dataframe, cached = self.workbook_cache.read(self.excel_file, sheets)
             self.display_data_in_tree()
-            self.status_var.set(f"Loaded: {self.dataframe.shape[0]} rows, {self.dataframe.shape[1]} columns")
-            messagebox.showinfo("Success", f"Excel file loaded!\n{self.dataframe.shape[0]} rows × {self.dataframe.shape[1]} columns")
+            source = " (from cache)" if cached else ""
+            self.status_var.set(f"Loaded{source}: {self.dataframe.shape[0]} rows, {self.dataframe.shape[1]} columns")
+            messagebox.showinfo("Success", f"File loaded!\n{self.dataframe.shape[0]} rows × {self.dataframe.shape[1]} columns")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load Excel file:\n{str(e)}")
@@ -268,10 +318,6 @@ class ExcelStructureGUI:
         if self.dataframe is None:
             return
         
-        # Clear existing
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
         # Define columns
         columns = list(self.dataframe.columns)
         self.tree["columns"] = columns
@@ -282,24 +328,36 @@ class ExcelStructureGUI:
             self.tree.column(col, width=100, anchor="w")
             self.tree.heading(col, text=col)
         
-        # Insert data
-        for idx, row in self.dataframe.iterrows():
-            values = [str(row[col]) if pd.notna(row[col]) else "" for col in columns]
-            self.tree.insert("", "end", text=str(idx), values=values)
+        # Rows are read from the DataFrame only when scrolled into view
+        self.data_grid.set_rows(len(self.dataframe), self._dataframe_rows)
         
-        self.info_label.config(text=f"Rows shown: {len(self.dataframe)}")
+        self.info_label.config(text=f"Double-click cells to edit • Rows: {len(self.dataframe)}")
+    
+    def _dataframe_rows(self, start, stop):
+        """Return (label, values) for DataFrame rows start..stop-1."""
+        block = self.dataframe.iloc[start:stop]
+        values = block.to_numpy(dtype=object)
+        present = block.notna().to_numpy()
+        
+        return [
+            (str(label), [str(value) if ok else "" for value, ok in zip(row, row_present)])
+            for label, row, row_present in zip(block.index, values, present)
+        ]
     
     def edit_cell(self, event):
         """Allow cell editing on double-click."""
-        item = self.tree.selection()[0]
+        item = self.tree.identify_row(event.y)
         col = self.tree.identify_column(event.x)
         
-        if col == "#0":
+        if not item or col == "#0":
             return
         
-        col_index = int(col) - 1
-        row_index = self.tree.index(item)
-        current_value = self.tree.item(item)["values"][col_index]
+        # Items are reused while scrolling, so resolve the DataFrame row now
+        col_index = int(col[1:]) - 1  # identify_column() returns "#N"
+        row_index = self.data_grid.position(item)
+        current_value = self.dataframe.iat[row_index, col_index]
+        if pd.isna(current_value):
+            current_value = ""
         
         # Create edit window
         edit_window = tk.Toplevel(self.root)
@@ -316,10 +374,8 @@ class ExcelStructureGUI:
         def save_edit():
             new_value = text_widget.get("1.0", "end").strip()
             self.dataframe.iloc[row_index, col_index] = new_value
-            
-            values = list(self.tree.item(item)["values"])
-            values[col_index] = new_value
-            self.tree.item(item, values=values)
+            self.plans.invalidate()
+            self.data_grid.refresh()
             
             edit_window.destroy()
             self.status_var.set(f"Updated cell at Row {row_index}")
@@ -374,64 +430,24 @@ class ExcelStructureGUI:
         
         try:
             # Clear existing tree
-            for item in self.structure_tree.get_children():
-                self.structure_tree.delete(item)
+            self._clear_structure_tree()
             
             # Set up tree columns
             self.structure_tree["columns"] = ()
             self.structure_tree.heading("#0", text="File Structure Preview")
             self.structure_tree.column("#0", width=400, anchor="w")
             
-            # Build structure tree
+            # Build structure tree from the shared plan
             structure_type = self.structure_type.get()
-            file_ext = self.file_extension.get() if not self.empty_folders.get() else ""
-            
-            # Track unique paths to avoid duplicates
-            paths_added = set()
-            item_count = 0
-            
-            for idx, row in self.dataframe.iterrows():
-                path_parts = []
-                
-                if structure_type == "folder_only" or self.empty_folders.get():
-                    # Create folder hierarchy from all columns
-                    for col in self.dataframe.columns:
-                        value = str(row[col]).strip()
-                        if value and value != "nan":
-                            path_parts.append(value)
-                    
-                    # Create folder path
-                    if path_parts:
-                        full_path = "/".join(path_parts)
-                        if full_path not in paths_added:
-                            self._insert_path_to_tree(path_parts, "📁", full_path)
-                            paths_added.add(full_path)
-                            item_count += 1
-                            
-                            # Add README if enabled
-                            if self.create_readme.get():
-                                readme_path = full_path + "/README.md"
-                                if readme_path not in paths_added:
-                                    paths_added.add(readme_path)
-                                    item_count += 1
-                
-                else:
-                    # Create folder structure with files
-                    for col in self.dataframe.columns[:-1]:
-                        value = str(row[col]).strip()
-                        if value and value != "nan":
-                            path_parts.append(value)
-                    
-                    # Add file from last column
-                    last_col_value = str(row[self.dataframe.columns[-1]]).strip()
-                    if last_col_value and last_col_value != "nan":
-                        path_parts.append(f"{last_col_value}{file_ext}")
-                        
-                        full_path = "/".join(path_parts)
-                        if full_path not in paths_added:
-                            self._insert_path_to_tree(path_parts, "📄", full_path)
-                            paths_added.add(full_path)
-                            item_count += 1
+            plan = self.plans.get(self.dataframe, self._plan_options())
+            
+            for path in plan.folders:
+                self._insert_path_to_tree(path, True)
+            for path in plan.files:
+                self._insert_path_to_tree(path, False)
+            
+            # READMEs are counted but not shown
+            item_count = len(plan)
             
             self.structure_preview_label.config(
                 text=f"Items in preview: {item_count} • Structure Type: {structure_type}",
@@ -443,44 +459,73 @@ class ExcelStructureGUI:
             messagebox.showerror("Error", f"Failed to preview structure:\n{str(e)}")
             self.structure_preview_label.config(text="Error generating preview", foreground="red")
     
-    def _insert_path_to_tree(self, path_parts, icon, full_path):
-        """Insert a file/folder path into the preview tree.
+    def _insert_path_to_tree(self, path, is_folder):
+        """Insert a '/'-separated file/folder path into the preview tree.
         
         Consolidates duplicate root folders - if a root already exists,
         items are added under the same parent instead of duplicating it.
+        Existing levels are found through the structure model, so each
+        insert costs one dictionary lookup per level.
         """
-        parent = ""
+        model = self.structure_model
+        node = CompactTree.ROOT
+        path_parts = path.split("/")
         
         for i, part in enumerate(path_parts):
-            # Determine if it's a file or folder
-            is_file = (i == len(path_parts) - 1) and ("." in part)
-            item_icon = icon if (i == len(path_parts) - 1) else "📁"
-            
-            # Check if this item already exists under the parent
-            found = False
-            for child in self.structure_tree.get_children(parent):
-                child_text = self.structure_tree.item(child)["text"]
-                # Extract just the name (remove emoji and space)
-                child_name = child_text.replace("📁 ", "").replace("📄 ", "").strip()
-                
-                # Match exact folder/file name
-                if child_name == part:
-                    parent = child
-                    found = True
-                    break
-            
-            if not found:
+            child = model.find(node, part)
+            
+            if child is None:
                 # Create new item with appropriate icon
-                if is_file:
-                    display_text = f"📄 {part}"
-                else:
-                    display_text = f"📁 {part}"
-                
-                parent = self.structure_tree.insert(
-                    parent, "end",
-                    text=display_text,
-                    tags=("file" if is_file else "folder",)
-                )
+                is_file = (i == len(path_parts) - 1) and not is_folder
+                child = int(self._insert_tree_item(self._tree_item(node), part, is_file))
+            
+            node = child
+    
+    def _tree_node(self, item):
+        """Return the model node shown by a Treeview item ("" = root)."""
+        return int(item) if item else CompactTree.ROOT
+    
+    def _tree_item(self, node):
+        """Return the Treeview item id of a model node."""
+        return str(node) if node != CompactTree.ROOT else ""
+    
+    def _insert_tree_item(self, parent, name, is_file):
+        """
+        Add an item to the structure model and show it in the Treeview.
+        
+        Args:
+            parent (str): Parent item id ("" for a root item)
+            name (str): File or folder name
+            is_file (bool): Insert as a file instead of a folder
+        
+        Returns:
+            str: Item id of the new item
+        """
+        node = self.structure_model.add_child(self._tree_node(parent), name, not is_file)
+        return self.structure_tree.insert(
+            parent, "end",
+            iid=self._tree_item(node),
+            text=f"📄 {name}" if is_file else f"📁 {name}",
+            tags=("file" if is_file else "folder",)
+        )
+    
+    def _tree_item_exists(self, parent, name):
+        """Return True if parent already has a child called name."""
+        return self.structure_model.find(self._tree_node(parent), name) is not None
+    
+    def _tree_item_is_file(self, item):
+        """Return True if the item is a file."""
+        return not self.structure_model.is_folder[self._tree_node(item)]
+    
+    def _delete_tree_item(self, item):
+        """Delete an item and its descendants from the model and the view."""
+        self.structure_model.remove(self._tree_node(item))
+        self.structure_tree.delete(item)
+    
+    def _clear_structure_tree(self):
+        """Remove every item from the structure model and the view."""
+        self.structure_tree.delete(*self.structure_tree.get_children())
+        self.structure_model = CompactTree()
     
     def add_root_folder(self):
         """Add a root folder to the structure."""
@@ -500,7 +545,11 @@ class ExcelStructureGUI:
                 messagebox.showwarning("Warning", "Please enter a folder name!")
                 return
             
-            self.structure_tree.insert("", "end", text=f"📁 {name}", tags=("folder",))
+            if self._tree_item_exists("", name):
+                messagebox.showwarning("Warning", f"'{name}' already exists here!")
+                return
+            
+            self._insert_tree_item("", name, is_file=False)
             self.status_var.set(f"Added root folder: {name}")
             dialog.destroy()
         
@@ -514,9 +563,8 @@ class ExcelStructureGUI:
             return
         
         parent_item = selected[0]
-        parent_text = self.structure_tree.item(parent_item)["text"]
         
-        if "📄" in parent_text:
+        if self._tree_item_is_file(parent_item):
             messagebox.showwarning("Warning", "Cannot add subfolder to a file!")
             return
         
@@ -536,7 +584,11 @@ class ExcelStructureGUI:
                 messagebox.showwarning("Warning", "Please enter a folder name!")
                 return
             
-            self.structure_tree.insert(parent_item, "end", text=f"📁 {name}", tags=("folder",))
+            if self._tree_item_exists(parent_item, name):
+                messagebox.showwarning("Warning", f"'{name}' already exists here!")
+                return
+            
+            self._insert_tree_item(parent_item, name, is_file=False)
             self.structure_tree.item(parent_item, open=True)
             self.status_var.set(f"Added subfolder: {name}")
             dialog.destroy()
@@ -551,9 +603,8 @@ class ExcelStructureGUI:
             return
         
         parent_item = selected[0]
-        parent_text = self.structure_tree.item(parent_item)["text"]
         
-        if "📄" in parent_text:
+        if self._tree_item_is_file(parent_item):
             messagebox.showwarning("Warning", "Cannot add file to another file!")
             return
         
@@ -580,7 +631,11 @@ class ExcelStructureGUI:
                 return
             
             full_name = f"{name}{ext}" if ext else name
-            self.structure_tree.insert(parent_item, "end", text=f"📄 {full_name}", tags=("file",))
+            if self._tree_item_exists(parent_item, full_name):
+                messagebox.showwarning("Warning", f"'{full_name}' already exists here!")
+                return
+            
+            self._insert_tree_item(parent_item, full_name, is_file=True)
             self.structure_tree.item(parent_item, open=True)
             self.status_var.set(f"Added file: {full_name}")
             dialog.destroy()
@@ -598,7 +653,7 @@ class ExcelStructureGUI:
         item_text = self.structure_tree.item(item)["text"]
         
         if messagebox.askyesno("Confirm", f"Delete '{item_text}'?"):
-            self.structure_tree.delete(item)
+            self._delete_tree_item(item)
             self.status_var.set(f"Deleted item")
     
     def show_context_menu(self, event):
@@ -619,7 +674,7 @@ class ExcelStructureGUI:
     
     def save_structure_json(self):
         """Save the tree structure as JSON."""
-        if not self.structure_tree.get_children():
+        if not len(self.structure_model):
             messagebox.showwarning("Warning", "Tree structure is empty!")
             return
         
@@ -629,40 +684,54 @@ class ExcelStructureGUI:
         )
         
         if file_path:
-            try:
-                structure_dict = self._tree_to_dict()
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(structure_dict, f, indent=2, ensure_ascii=False)
-                messagebox.showinfo("Success", f"Structure saved to:\n{file_path}")
-                self.log(f"✓ Structure saved to JSON: {file_path}")
-                self.status_var.set(f"Structure saved")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save structure:\n{str(e)}")
+            # Serialize a snapshot so the UI stays free while writing
+            snapshot = self.structure_model.snapshot()
+            thread = threading.Thread(target=self._save_structure_json_thread, args=(snapshot, file_path))
+            thread.start()
     
-    def _tree_to_dict(self):
-        """Convert treeview to dictionary structure."""
-        def item_to_dict(item):
-            text = self.structure_tree.item(item)["text"]
-            children = self.structure_tree.get_children(item)
-            
-            is_file = "📄" in text
-            name = text.replace("📁 ", "").replace("📄 ", "")
-            
-            if is_file:
-                return {"name": name, "type": "file"}
+    def _save_structure_json_thread(self, model, file_path):
+        """Write a structure snapshot as JSON in a separate thread."""
+        try:
+            structure_dict = self._tree_to_dict(model)
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(structure_dict, f, indent=2, ensure_ascii=False)
+            self.log(f"✓ Structure saved to JSON: {file_path}")
+            self.log_channel.call(self.status_var.set, f"Structure saved")
+            self.log_channel.call(messagebox.showinfo, "Success", f"Structure saved to:\n{file_path}")
+        except Exception as e:
+            self.log_channel.call(messagebox.showerror, "Error", f"Failed to save structure:\n{str(e)}")
+    
+    @staticmethod
+    def _tree_to_dict(model):
+        """
+        Convert a structure model to a nested list of dictionaries.
+        
+        Args:
+            model (CompactTree): Structure, usually a snapshot
+        
+        Returns:
+            list: {"name", "type"[, "children"]} dictionaries
+        """
+        names = model.names
+        is_folder = model.is_folder
+        
+        root = []
+        # (node, list its children go into), walked without recursion
+        pending = [(node, root) for node in reversed(list(model.children()))]
+        while pending:
+            node, siblings = pending.pop()
+            if is_folder[node]:
+                children = []
+                siblings.append({"name": names[node], "type": "folder", "children": children})
+                pending.extend((child, children) for child in reversed(list(model.children(node))))
             else:
-                return {
-                    "name": name,
-                    "type": "folder",
-                    "children": [item_to_dict(child) for child in children]
-                }
+                siblings.append({"name": names[node], "type": "file"})
         
-        items = self.structure_tree.get_children()
-        return [item_to_dict(item) for item in items]
+        return root
     
     def generate_from_tree(self):
         """Generate file structure from the manually built tree."""
-        if not self.structure_tree.get_children():
+        if not len(self.structure_model):
             messagebox.showwarning("Warning", "Tree structure is empty!")
             return
         
@@ -670,70 +739,90 @@ class ExcelStructureGUI:
             messagebox.showwarning("Warning", "Please select output folder!")
             return
         
-        thread = threading.Thread(target=self._generate_from_tree_thread)
+        # Everything the worker needs is read here, on the Tk thread
+        snapshot = self.structure_model.snapshot()
+        create_readme = self.create_readme.get()
+        workers = read_workers(self.workers_var)
+        link_mode = None if self.link_mode.get() == "off" else self.link_mode.get()
+        
+        self.progress_panel.start()
+        thread = threading.Thread(
+            target=self._generate_from_tree_thread, args=(snapshot, create_readme, workers, link_mode)
+        )
         thread.start()
     
-    def _generate_from_tree_thread(self):
-        """Generate structure from tree in a separate thread."""
+    @staticmethod
+    def _tree_entries(model, create_readme):
+        """
+        Yield materialize() entries for a structure model.
+        
+        Args:
+            model (CompactTree): Structure, usually a snapshot
+            create_readme (bool): Add a README.md to folders without one
+        
+        Yields:
+            tuple: (path, is_folder) or (path, False, content)
+        """
+        names = model.names
+        is_folder = model.is_folder
+        
+        for node, path, _ in model.walk():
+            if not is_folder[node]:
+                yield path, False
+                continue
+            
+            yield path, True
+            if create_readme and model.find(node, "README.md") is None:
+                readme = f"# {names[node]}\n\nCreated from tree structure.\n".encode("utf-8")
+                yield f"{path}/README.md", False, readme
+    
+    def _generate_from_tree_thread(self, model, create_readme, workers=1, link_mode=None):
+        """Generate structure from a structure snapshot in a separate thread."""
         try:
             self.log("\n" + "="*60)
             self.log("Starting structure generation from tree...")
             self.log(f"Output Path: {self.output_path}")
             self.log("="*60)
             
-            os.makedirs(self.output_path, exist_ok=True)
-            created_count = 0
-            
-            def create_from_tree_item(parent_path, item):
-                nonlocal created_count
-                
-                text = self.structure_tree.item(item)["text"]
-                is_file = "📄" in text
-                name = text.replace("📁 ", "").replace("📄 ", "")
-                
-                if is_file:
-                    # Create file
-                    file_path = os.path.join(parent_path, name)
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(f"File: {name}\nCreated from tree structure.\n")
-                    self.log(f"✓ File: {os.path.relpath(file_path, self.output_path)}")
-                    created_count += 1
-                else:
-                    # Create folder
-                    folder_path = os.path.join(parent_path, name)
-                    os.makedirs(folder_path, exist_ok=True)
-                    self.log(f"✓ Folder: {os.path.relpath(folder_path, self.output_path)}")
-                    created_count += 1
-                    
-                    # Create README if enabled
-                    if self.create_readme.get():
-                        readme_path = os.path.join(folder_path, "README.md")
-                        if not os.path.exists(readme_path):
-                            with open(readme_path, "w", encoding="utf-8") as f:
-                                f.write(f"# {name}\n\nCreated from tree structure.\n")
-                    
-                    # Process children
-                    children = self.structure_tree.get_children(item)
-                    for child in children:
-                        create_from_tree_item(folder_path, child)
-            
-            # Process all root items
-            root_items = self.structure_tree.get_children()
-            for root_item in root_items:
-                create_from_tree_item(self.output_path, root_item)
+            created_items, errors, _ = materialize(
+                self.output_path, self._tree_entries(model, create_readme), workers=workers,
+                link_mode=link_mode, progress=self.progress_panel.report, cancel=self.progress_panel.token
+            )
+            
+            for item_type, rel_path in created_items:
+                self.log(f"✓ {item_type.title()}: {rel_path}")
+            
+            for rel_path, error in errors:
+                self.log(f"✗ {rel_path}: {error}")
+            
+            created_count = len(created_items)
             
             self.log("="*60)
             self.log(f"✓ Structure generation complete!")
             self.log(f"  Total items created: {created_count}")
+            if errors:
+                self.log(f"  Failed items: {len(errors)}")
             self.log("="*60 + "\n")
             
-            self.status_var.set(f"Success! Created {created_count} items")
-            messagebox.showinfo("Success", f"Structure generated successfully!\n\nCreated {created_count} items in:\n{self.output_path}")
+            if errors:
+                self.log_channel.call(self.status_var.set, f"Created {created_count} items, {len(errors)} failed")
+                self.log_channel.call(
+                    messagebox.showwarning, "Completed with Errors",
+                    f"Created {created_count} items in:\n{self.output_path}\n\n{len(errors)} items failed; see the log for details."
+                )
+            else:
+                self.log_channel.call(self.status_var.set, f"Success! Created {created_count} items")
+                self.log_channel.call(messagebox.showinfo, "Success", f"Structure generated successfully!\n\nCreated {created_count} items in:\n{self.output_path}")
             
+        except GenerationCancelled as e:
+            self.log(f"⚠ {e}; items already created were kept\n")
+            self.log_channel.call(self.status_var.set, str(e))
         except Exception as e:
             self.log(f"✗ Error: {str(e)}\n")
-            messagebox.showerror("Error", f"Failed to generate structure:\n{str(e)}")
-            self.status_var.set("Error generating structure")
+            self.log_channel.call(messagebox.showerror, "Error", f"Failed to generate structure:\n{str(e)}")
+            self.log_channel.call(self.status_var.set, "Error generating structure")
+        finally:
+            self.progress_panel.finish()
     
     def generate_structure_threaded(self):
         """Generate structure in a separate thread."""
@@ -745,77 +834,86 @@ class ExcelStructureGUI:
             messagebox.showwarning("Warning", "Please select output folder!")
             return
         
-        thread = threading.Thread(target=self.generate_structure)
+        # Options and the plan are resolved here, on the Tk thread, so cell
+        # edits during generation cannot reach the worker or a stale cache
+        options = self._plan_options()
+        workers = read_workers(self.workers_var)
+        link_mode = None if self.link_mode.get() == "off" else self.link_mode.get()
+        try:
+            plan = self.plans.get(self.dataframe, options)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to plan structure:\n{str(e)}")
+            return
+        
+        self.progress_panel.start()
+        thread = threading.Thread(target=self.generate_structure, args=(plan, options, workers, link_mode))
         thread.start()
     
-    def generate_structure(self):
-        """Generate the file structure."""
+    def _plan_options(self):
+        """Read the Options tab into a PlanOptions (Tk thread only)."""
+        folders_only = self.structure_type.get() == "folder_only" or self.empty_folders.get()
+        return PlanOptions(
+            folders_only=folders_only,
+            file_ext=self.file_extension.get(),
+            readme=folders_only and self.create_readme.get()
+        )
+    
+    def generate_structure(self, plan, options, workers=1, link_mode=None):
+        """
+        Generate the file structure (runs on a worker thread).
+        
+        Args:
+            plan (StructurePlan): Plan resolved on the Tk thread
+            options (PlanOptions): What the plan was built with
+            workers (int): Threads used to write files
+            link_mode (str): None, 'hardlink' or 'reflink'
+        """
         try:
             self.log("\n" + "="*60)
             self.log("Starting structure generation...")
             self.log(f"Output Path: {self.output_path}")
-            self.log(f"Structure Type: {self.structure_type.get()}")
+            self.log(f"Structure Type: {'folders only' if options.folders_only else 'folders + files'}")
             self.log("="*60)
             
-            os.makedirs(self.output_path, exist_ok=True)
-            created_count = 0
+            created_items, errors, _ = materialize(
+                self.output_path, plan.entries(), source="Excel structure", workers=workers, link_mode=link_mode,
+                progress=self.progress_panel.report, cancel=self.progress_panel.token
+            )
             
-            structure_type = self.structure_type.get()
-            file_ext = self.file_extension.get() if not self.empty_folders.get() else ""
-            
-            for idx, row in self.dataframe.iterrows():
-                current_path = self.output_path
-                
-                if structure_type == "folder_only" or self.empty_folders.get():
-                    # Create folder hierarchy from all columns
-                    for col in self.dataframe.columns:
-                        value = str(row[col]).strip()
-                        if value and value != "nan":
-                            current_path = os.path.join(current_path, value)
-                    
-                    os.makedirs(current_path, exist_ok=True)
-                    created_count += 1
-                    self.log(f"✓ Folder: {os.path.relpath(current_path, self.output_path)}")
-                    
-                    # Create README if selected
-                    if self.create_readme.get():
-                        readme_path = os.path.join(current_path, "README.md")
-                        if not os.path.exists(readme_path):
-                            with open(readme_path, "w", encoding="utf-8") as f:
-                                f.write(f"# {os.path.basename(current_path)}\n\nCreated from Excel structure.\n")
-                
-                else:
-                    # Create folder structure with files
-                    for col in self.dataframe.columns[:-1]:
-                        value = str(row[col]).strip()
-                        if value and value != "nan":
-                            current_path = os.path.join(current_path, value)
-                    
-                    os.makedirs(current_path, exist_ok=True)
-                    
-                    # Create file from last column
-                    last_col_value = str(row[self.dataframe.columns[-1]]).strip()
-                    if last_col_value and last_col_value != "nan":
-                        file_path = os.path.join(current_path, f"{last_col_value}{file_ext}")
-                        if not os.path.exists(file_path):
-                            with open(file_path, "w", encoding="utf-8") as f:
-                                f.write(f"File: {last_col_value}\nCreated from Excel structure.\n")
-                            created_count += 1
-                            self.log(f"✓ File: {os.path.relpath(file_path, self.output_path)}")
+            for item_type, rel_path in created_items:
+                self.log(f"✓ {item_type.title()}: {rel_path}")
+            
+            for rel_path, error in errors:
+                self.log(f"✗ {rel_path}: {error}")
+            
+            created_count = len(created_items)
             
             self.log("="*60)
             self.log(f"✓ Structure generation complete!")
             self.log(f"  Total items created: {created_count}")
+            if errors:
+                self.log(f"  Failed items: {len(errors)}")
             self.log("="*60 + "\n")
             
-            self.status_var.set(f"Success! Created {created_count} items")
-            messagebox.showinfo("Success", f"Structure generated successfully!\n\nCreated {created_count} items in:\n{self.output_path}")
+            if errors:
+                self.log_channel.call(self.status_var.set, f"Created {created_count} items, {len(errors)} failed")
+                self.log_channel.call(
+                    messagebox.showwarning, "Completed with Errors",
+                    f"Created {created_count} items in:\n{self.output_path}\n\n{len(errors)} items failed; see the log for details."
+                )
+            else:
+                self.log_channel.call(self.status_var.set, f"Success! Created {created_count} items")
+                self.log_channel.call(messagebox.showinfo, "Success", f"Structure generated successfully!\n\nCreated {created_count} items in:\n{self.output_path}")
             
+        except GenerationCancelled as e:
+            self.log(f"⚠ {e}; items already created were kept\n")
+            self.log_channel.call(self.status_var.set, str(e))
         except Exception as e:
             self.log(f"✗ Error: {str(e)}\n")
-            messagebox.showerror("Error", f"Failed to generate structure:\n{str(e)}")
-            self.status_var.set("Error generating structure")
-
+            self.log_channel.call(messagebox.showerror, "Error", f"Failed to generate structure:\n{str(e)}")
+            self.log_channel.call(self.status_var.set, "Error generating structure")
+        finally:
+            self.progress_panel.finish()
 
 def main():
     """Main function."""
@@ -0,0 +1,429 @@
+"""
+GUI Support
+Thread-safe helpers shared by the Tkinter front ends
+"""
+
+import queue
+import tkinter as tk
+from tkinter import font as tkfont
+from tkinter import ttk
+
+from structure_writer import CancelToken, format_progress
+
+
+# Range of the "Workers" Spinbox in the generator GUIs
+MAX_WORKERS = 64
+
+
+def read_workers(variable, maximum=MAX_WORKERS):
+    """
+    Read a "Workers" Spinbox value (Tk thread only).
+    
+    The Spinbox accepts free text, so anything that is not a whole
+    number falls back to 1 and numbers are clamped to 1..maximum. The
+    variable is set to the value used, so the field shows it.
+    
+    Args:
+        variable (tk.StringVar): The Spinbox's textvariable
+        maximum (int): Upper bound of the Spinbox
+    
+    Returns:
+        int: Number of writer threads
+    """
+    try:
+        workers = int(variable.get().strip())
+    except ValueError:
+        workers = 1
+    workers = min(max(workers, 1), maximum)
+    variable.set(str(workers))
+    return workers
+
+
+class LogChannel:
+    """
+    Queue-backed log for a Text widget that worker threads can write to.
+    
+    Workers only put events on a queue; a root.after() pump on the Tk
+    thread drains them in batches and inserts each batch with a single
+    widget call. The widget keeps at most max_lines lines, and when the
+    backlog alone is larger than that the oldest queued lines are
+    dropped without ever being rendered. Logging therefore costs a
+    queue put on the worker, however many lines are produced.
+    
+    Besides text, workers can queue callables with call(), e.g. to show
+    a message box or update a status bar from the Tk thread.
+    """
+    
+    def __init__(self, root, widget, max_lines=5000, batch_size=500, interval=40):
+        """
+        Initialize the channel and start pumping.
+        
+        Args:
+            root (tk.Tk): Window whose after() drives the pump
+            widget (tk.Text): Text or ScrolledText to append to
+            max_lines (int): Lines kept in the widget
+            batch_size (int): Events handled per pump tick
+            interval (int): Milliseconds between ticks while idle
+        """
+        self.root = root
+        self.widget = widget
+        self.max_lines = max_lines
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue = queue.SimpleQueue()
+        self._dropped = 0
+        self.root.after(self.interval, self._pump)
+    
+    def put(self, message):
+        """Queue a log line; safe to call from any thread."""
+        self._queue.put(message)
+    
+    def call(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the Tk thread, in log order."""
+        self._queue.put((func, args, kwargs))
+    
+    def clear(self):
+        """Empty the widget and discard queued lines (Tk thread only)."""
+        self._drain_lines(discard=True)
+        self.widget.delete("1.0", "end")
+    
+    def _drain_lines(self, discard=False):
+        """Pop queued events, running callables and collecting text."""
+        lines = []
+        limit = None if discard else self.batch_size
+        
+        # Lines that would be trimmed right away are never rendered
+        backlog = self._queue.qsize()
+        if not discard and backlog > self.max_lines + self.batch_size:
+            skip = backlog - self.max_lines
+        else:
+            skip = 0
+        
+        handled = 0
+        while limit is None or handled < limit:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if isinstance(event, tuple):
+                if lines:
+                    self._insert(lines)
+                    lines = []
+                func, args, kwargs = event
+                func(*args, **kwargs)
+            elif skip:
+                skip -= 1
+                self._dropped += 1
+                continue
+            elif not discard:
+                lines.append(event)
+            handled += 1
+        
+        if lines:
+            self._insert(lines)
+    
+    def _insert(self, lines):
+        """Append lines in one insert and trim the widget to max_lines."""
+        widget = self.widget
+        if self._dropped:
+            widget.insert("end", f"… {self._dropped} earlier lines not shown\n")
+            self._dropped = 0
+        widget.insert("end", "\n".join(lines) + "\n")
+        
+        line_count = int(widget.index("end-1c").split(".")[0])
+        if line_count > self.max_lines:
+            widget.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+        widget.see("end")
+    
+    def _pump(self):
+        """Drain one batch and reschedule; quicker while there is a backlog."""
+        try:
+            self._drain_lines()
+        finally:
+            delay = 1 if not self._queue.empty() else self.interval
+            self.root.after(delay, self._pump)
+
+
+class RowWindow:
+    """
+    Scrolling shared by VirtualRowView and VirtualGrid.
+    
+    Keeps a window of _visible rows starting at row _first out of
+    row_count, and moves it from the scrollbar, the mouse wheel and the
+    paging keys. Subclasses set self.scrollbar and implement refresh()
+    to redraw the window.
+    """
+    
+    WHEEL_ROWS = 3
+    
+    def _init_window(self, visible):
+        self.row_count = 0
+        self._first = 0
+        self._visible = visible
+    
+    def _bind_scrolling(self, widget, keys):
+        """Route wheel events and keys ((sequence, step) pairs) of widget."""
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+        for key, step in keys:
+            widget.bind(key, lambda event, step=step: self._on_key(step))
+    
+    def scroll_to(self, first):
+        """Make row first the top visible row."""
+        first = max(0, min(first, self.row_count - self._visible))
+        if first != self._first:
+            self._first = first
+            self.refresh()
+    
+    def _set_visible(self, visible):
+        """Resize the window to visible rows, e.g. on <Configure>."""
+        visible = max(1, visible)
+        if visible != self._visible:
+            self._visible = visible
+            self._first = max(0, min(self._first, self.row_count - visible))
+            self.refresh()
+    
+    def _update_scrollbar(self):
+        if self.row_count:
+            last = min(self._first + self._visible, self.row_count)
+            self.scrollbar.set(self._first / self.row_count, last / self.row_count)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.row_count))
+        elif action == "scroll":
+            step = self._visible if unit == "pages" else 1
+            self.scroll_to(self._first + int(amount) * step)
+    
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self._first - self.WHEEL_ROWS)
+        else:
+            self.scroll_to(self._first + self.WHEEL_ROWS)
+        return "break"
+    
+    def _on_key(self, step):
+        if step == "home":
+            self.scroll_to(0)
+        elif step == "end":
+            self.scroll_to(self.row_count)
+        elif step == "page":
+            self.scroll_to(self._first + self._visible)
+        elif step == "-page":
+            self.scroll_to(self._first - self._visible)
+        else:
+            self.scroll_to(self._first + step)
+        return "break"
+
+
+class VirtualRowView(RowWindow, ttk.Frame):
+    """
+    Read-only, scrollable list that only renders the rows in view.
+    
+    Rows come from a get_row(index) callback, so the view holds no copy
+    of the data and a million-row preview costs the same to draw as a
+    ten-row one. The Text widget inside always contains exactly the
+    visible rows; the scrollbar, mouse wheel and paging keys move the
+    window over the full row range.
+    """
+    
+    def __init__(self, parent, **text_options):
+        """
+        Initialize the view.
+        
+        Args:
+            parent (tk.Widget): Container widget
+            **text_options: Extra options for the inner tk.Text
+        """
+        super().__init__(parent)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        
+        self.text = tk.Text(self, wrap="none", state="disabled", **text_options)
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        
+        self._init_window(visible=1)
+        self.get_row = None
+        self._line_height = tkfont.Font(font=self.text.cget("font")).metrics("linespace")
+        
+        self.text.bind("<Configure>", self._on_resize)
+        self._bind_scrolling(self.text, (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                                         ("<Home>", "home"), ("<End>", "end")))
+    
+    def set_rows(self, row_count, get_row):
+        """
+        Show a new set of rows, scrolled to the top.
+        
+        Args:
+            row_count (int): Number of rows
+            get_row (callable): Returns the text of row index (0-based)
+        """
+        self.row_count = row_count
+        self.get_row = get_row
+        self._first = 0
+        self.refresh()
+    
+    def refresh(self):
+        """Redraw the visible window of rows."""
+        last = min(self._first + self._visible, self.row_count)
+        lines = [self.get_row(index) for index in range(self._first, last)]
+        
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state="disabled")
+        self._update_scrollbar()
+    
+    def _on_resize(self, event):
+        self._set_visible((event.height - 8) // self._line_height)
+
+
+class VirtualGrid(RowWindow):
+    """
+    Drive a ttk.Treeview as a scrolling window onto a large table.
+    
+    Only the visible rows plus a small buffer exist as Treeview items;
+    they are reused and refilled from a get_rows(start, stop) callback
+    as the window moves, so loading a million-row table costs the same
+    as loading a screenful. The vertical scrollbar, mouse wheel and
+    paging keys move the window; position() maps an item back to the
+    row it currently shows.
+    """
+    
+    def __init__(self, tree, scrollbar, buffer=5):
+        """
+        Take over vertical scrolling of a Treeview.
+        
+        Args:
+            tree (ttk.Treeview): Flat Treeview to fill
+            scrollbar (ttk.Scrollbar): Vertical scrollbar for the full range
+            buffer (int): Extra rows kept below the visible ones
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.buffer = buffer
+        self._init_window(visible=20)
+        self.get_rows = None
+        
+        row_height = ttk.Style().lookup("Treeview", "rowheight")
+        self._row_height = int(row_height) if row_height else 20
+        
+        scrollbar.config(command=self._on_scrollbar)
+        tree.bind("<Configure>", self._on_resize)
+        self._bind_scrolling(tree, (("<Prior>", "-page"), ("<Next>", "page"), ("<Control-Home>", "home"),
+                                    ("<Control-End>", "end")))
+    
+    def set_rows(self, row_count, get_rows):
+        """
+        Show a new table, scrolled to the top.
+        
+        Args:
+            row_count (int): Number of rows
+            get_rows (callable): get_rows(start, stop) returns a list of
+                                 (label, values) for rows start..stop-1
+        """
+        self.row_count = row_count
+        self.get_rows = get_rows
+        self._first = 0
+        self.refresh()
+    
+    def position(self, item):
+        """Return the 0-based row shown by a Treeview item."""
+        return self._first + self.tree.index(item)
+    
+    def refresh(self):
+        """Refill the items from the current window of rows."""
+        tree = self.tree
+        stop = min(self._first + self._visible + self.buffer, self.row_count)
+        rows = self.get_rows(self._first, stop) if self.get_rows and stop else []
+        
+        items = tree.get_children()
+        for index, (label, values) in enumerate(rows):
+            if index < len(items):
+                tree.item(items[index], text=label, values=values)
+            else:
+                tree.insert("", "end", text=label, values=values)
+        if len(items) > len(rows):
+            tree.delete(*items[len(rows):])
+        
+        # Selections belong to rows, not to the reused items
+        tree.selection_remove(tree.selection())
+        tree.yview_moveto(0)
+        self._update_scrollbar()
+    
+    def _on_resize(self, event):
+        # Leave room for the heading row
+        self._set_visible((event.height - self._row_height - 4) // self._row_height)
+
+
+class ProgressPanel(ttk.Frame):
+    """
+    Progress bar, rate/ETA label and Cancel button for a background run.
+    
+    start() runs on the Tk thread and hands out a fresh CancelToken;
+    report() and finish() may be called from the worker and are routed
+    to the Tk thread through a LogChannel.
+    """
+    
+    def __init__(self, parent, channel):
+        """
+        Initialize the panel.
+        
+        Args:
+            parent (tk.Widget): Container widget
+            channel (LogChannel): Used to run updates on the Tk thread
+        """
+        super().__init__(parent)
+        self.channel = channel
+        self.token = CancelToken()
+        self.columnconfigure(0, weight=1)
+        
+        self.bar = ttk.Progressbar(self, orient="horizontal", mode="determinate", maximum=1)
+        self.bar.grid(row=0, column=0, sticky="ew", padx=5)
+        self.label = ttk.Label(self, text="Idle", width=48, anchor="w")
+        self.label.grid(row=0, column=1, sticky="w", padx=5)
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self.cancel, state="disabled")
+        self.cancel_button.grid(row=0, column=2, padx=5)
+    
+    def start(self):
+        """
+        Reset the panel for a new run (Tk thread only).
+        
+        Returns:
+            CancelToken: Token to pass to the run
+        """
+        self.token = CancelToken()
+        self.bar.configure(value=0, maximum=1)
+        self.label.config(text="Starting...")
+        self.cancel_button.config(state="normal")
+        return self.token
+    
+    def report(self, progress):
+        """Progress callback for structure_writer; safe from any thread."""
+        self.channel.call(self._show, progress)
+    
+    def finish(self):
+        """Mark the run as over; safe from any thread."""
+        self.channel.call(self.cancel_button.config, state="disabled")
+    
+    def cancel(self):
+        """Ask the current run to stop after the item in progress."""
+        self.token.cancel()
+        self.label.config(text="Cancelling...")
+        self.cancel_button.config(state="disabled")
+    
+    def _show(self, progress):
+        if progress.total is None:
+            # Size not known yet (streamed input); just show activity
+            self.bar.configure(mode="indeterminate")
+            self.bar.step()
+        else:
+            self.bar.configure(mode="determinate", maximum=max(progress.total, 1), value=progress.done)
+        if not self.token.cancelled:
+            self.label.config(text=format_progress(progress))
@@ -0,0 +1,198 @@
+"""
+Output Sinks
+Archive writers that generated structures can be streamed into
+Used by structure_writer.materialize() instead of the filesystem
+"""
+
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from io import BytesIO
+
+
+# Archive suffixes recognised by open_sink(), longest first
+ARCHIVE_SUFFIXES = (
+    ('.tar.gz', 'tar', 'gz'),
+    ('.tar.bz2', 'tar', 'bz2'),
+    ('.tar.xz', 'tar', 'xz'),
+    ('.tgz', 'tar', 'gz'),
+    ('.tar', 'tar', ''),
+    ('.zip', 'zip', ''),
+)
+
+
+class OutputSink:
+    """
+    Destination that planned folders and files are written into.
+    
+    Entries arrive in plan order (parents before children) and are
+    written sequentially; a sink never reads back what it wrote. Use it
+    as a context manager, or call close() when done.
+    """
+    
+    def add_folder(self, path):
+        """
+        Add a folder entry.
+        
+        Args:
+            path (str): '/'-separated relative path
+        """
+        raise NotImplementedError
+    
+    def add_file(self, path, content):
+        """
+        Add a file entry.
+        
+        Args:
+            path (str): '/'-separated relative path
+            content (bytes): File content
+        
+        Returns:
+            bool: False if the path was already in the sink and skipped
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """Finish the output and release the target."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class ZipSink(OutputSink):
+    """
+    Stream entries into a zip archive.
+    
+    Folders become explicit 'name/' entries. The target may be a path or
+    a writable binary file object, including unseekable ones such as
+    sys.stdout.buffer, in which case zipfile writes data descriptors.
+    """
+    
+    def __init__(self, target, compress=False):
+        """
+        Initialize the sink.
+        
+        Args:
+            target (str or file): Archive path or binary file object
+            compress (bool): Deflate file content; placeholders are tiny,
+                             so entries are stored by default
+        """
+        self.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._zip = zipfile.ZipFile(target, 'w', self.compress_type)
+        self._date_time = time.localtime()[:6]
+    
+    def add_folder(self, path):
+        info = zipfile.ZipInfo(f"{path}/", self._date_time)
+        # drwxr-xr-x plus the MS-DOS directory flag
+        info.external_attr = (0o40755 << 16) | 0x10
+        self._zip.writestr(info, b'')
+    
+    def add_file(self, path, content):
+        if path in self._zip.NameToInfo:
+            return False
+        info = zipfile.ZipInfo(path, self._date_time)
+        info.external_attr = 0o100644 << 16
+        info.compress_type = self.compress_type
+        self._zip.writestr(info, content)
+        return True
+    
+    def close(self):
+        self._zip.close()
+
+
+class TarSink(OutputSink):
+    """
+    Stream entries into a tar archive, optionally compressed.
+    
+    The archive is opened in tarfile's stream mode ('w|'), so nothing is
+    ever seeked; the set of file names written, used to skip duplicates
+    as ZipSink does, is the only state that grows with the archive.
+    """
+    
+    def __init__(self, target, compression=''):
+        """
+        Initialize the sink.
+        
+        Args:
+            target (str or file): Archive path or binary file object
+            compression (str): '', 'gz', 'bz2' or 'xz'
+        """
+        mode = f"w|{compression}"
+        if isinstance(target, (str, os.PathLike)):
+            self._tar = tarfile.open(target, mode, format=tarfile.PAX_FORMAT)
+        else:
+            self._tar = tarfile.open(fileobj=target, mode=mode, format=tarfile.PAX_FORMAT)
+        self._mtime = int(time.time())
+        self._files = set()
+    
+    def add_folder(self, path):
+        info = tarfile.TarInfo(path)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = self._mtime
+        self._tar.addfile(info)
+    
+    def add_file(self, path, content):
+        if path in self._files:
+            return False
+        self._files.add(path)
+        info = tarfile.TarInfo(path)
+        info.size = len(content)
+        info.mode = 0o644
+        info.mtime = self._mtime
+        self._tar.addfile(info, BytesIO(content))
+        return True
+    
+    def close(self):
+        self._tar.close()
+
+
+def archive_format(path):
+    """
+    Return (format, compression) for an archive path, or None.
+    
+    Args:
+        path (str): File name such as 'skeleton.tar.gz'
+    """
+    lowered = str(path).lower()
+    for suffix, kind, compression in ARCHIVE_SUFFIXES:
+        if lowered.endswith(suffix):
+            return kind, compression
+    return None
+
+
+def open_sink(target, archive_type=None, compress=False):
+    """
+    Open an archive sink for a path, picking the format by its suffix.
+    
+    Args:
+        target (str): Archive path, or '-' for standard output
+        archive_type (str): Force a format: 'zip', 'tar', 'tar.gz',
+                            'tar.bz2' or 'tar.xz' (required for '-')
+        compress (bool): Deflate zip entries
+    
+    Returns:
+        OutputSink: ZipSink or TarSink
+    """
+    if archive_type:
+        kind, _, compression = archive_type.partition('.')
+    else:
+        detected = archive_format(target)
+        if detected is None:
+            raise ValueError(f"Unknown archive type for {target}; use .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz")
+        kind, compression = detected
+    
+    if target == '-':
+        target = sys.stdout.buffer
+    
+    if kind == 'zip':
+        return ZipSink(target, compress)
+    if kind == 'tar':
+        return TarSink(target, compression)
+    raise ValueError(f"Unknown archive type: {archive_type}")
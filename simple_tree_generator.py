@@ -7,6 +7,10 @@ import os
 import sys
 from pathlib import Path
 
+from output_sinks import archive_format, open_sink
+from structure_writer import materialize
+from tree_lexer import iter_tree_items
+
 
 def parse_tree_to_items(tree_text):
     """
@@ -14,84 +18,36 @@ def parse_tree_to_items(tree_text):
     
     Supports tree characters: ├──, │, └──
     Also supports simple indentation
+    Paths are full paths built from the indentation, e.g. 'MyProject/src/main.py'
     """
-    items = []
-    lines = tree_text.strip().split('\n')
-    
-    for line in lines:
-        # Extract actual path, removing tree characters
-        cleaned = line
-        tree_chars = ['├── ', '├─', '│   ', '│', '└── ', '└─', '   ', '  ']
-        
-        for char in tree_chars:
-            cleaned = cleaned.replace(char, '')
-        
-        cleaned = cleaned.strip()
-        
-        if cleaned:
-            is_folder = cleaned.endswith('/')
-            if is_folder:
-                cleaned = cleaned[:-1]
-            items.append((cleaned, is_folder))
-    
-    return items
+    return list(iter_tree_items(tree_text))
 
 
-def build_full_paths(items):
-    """
-    Convert flat list to full paths with hierarchy.
-    """
-    paths = []
-    path_stack = []
-    
-    for item, is_folder in items:
-        # Count leading spaces/indentation to determine depth
-        # This is simplified - assumes consistent indentation
-        depth = 0
-        
-        # Adjust path stack based on hierarchy
-        path_stack = path_stack[:depth]
-        path_stack.append(item)
-        
-        full_path = '/'.join(path_stack)
-        paths.append((full_path, is_folder))
-    
-    return paths
-
-
-def create_structure(base_path, tree_text):
+def create_structure(base_path, tree_text, workers=1, link_mode=None, sink=None):
     """
     Create folder structure from tree text.
     
     Args:
         base_path: Where to create the structure
         tree_text: Tree structure as string
+        workers: Threads used to write files (1 = sequential)
+        link_mode: None, 'hardlink' or 'reflink' to share identical placeholders
+        sink: Optional archive sink (see output_sinks); base_path is then unused
         
     Returns:
         (success: bool, message: str, created_items: list)
     """
     try:
-        os.makedirs(base_path, exist_ok=True)
+        created_items, errors, _ = materialize(
+            base_path, iter_tree_items(tree_text), workers=workers, link_mode=link_mode, sink=sink
+        )
         
-        items = parse_tree_to_items(tree_text)
-        created = []
+        icons = {'folder': '📁', 'file': '📄'}
+        created = [(icons[item_type], path) for item_type, path in created_items]
         
-        # Simple approach: create folders and files
-        for item, is_folder in items:
-            full_path = os.path.join(base_path, item)
-            
-            if is_folder:
-                os.makedirs(full_path, exist_ok=True)
-                created.append(('📁', item))
-            else:
-                # Create parent directories if needed
-                parent_dir = os.path.dirname(full_path)
-                os.makedirs(parent_dir, exist_ok=True)
-                
-                # Create file with placeholder content
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(f"File: {os.path.basename(item)}\nCreated from tree structure.\n")
-                created.append(('📄', item))
+        if errors:
+            path, error = errors[0]
+            return False, f"Created {len(created)} items, {len(errors)} failed (first: {path}: {error})", created
         
         return True, f"Created {len(created)} items", created
     
@@ -177,6 +133,8 @@ def interactive_mode():
     output_path = input("\n📁 Enter output folder path (or press Enter for 'generated_structure'): ").strip()
     if not output_path:
         output_path = "generated_structure"
+    if archive_format(output_path):
+        print("   📦 Output ends in an archive suffix; the structure will be written into it")
     
     # Get tree text
     print("\n📝 Enter your tree structure (type 'END' on a new line when done):")
@@ -211,7 +169,11 @@ def interactive_mode():
     
     # Create structure
     print("\n⏳ Creating structure...")
-    success, message, created = create_structure(output_path, tree_text)
+    if archive_format(output_path):
+        with open_sink(output_path) as sink:
+            success, message, created = create_structure(output_path, tree_text, sink=sink)
+    else:
+        success, message, created = create_structure(output_path, tree_text)
     
     if success:
         print(f"\n✅ {message}")
@@ -0,0 +1,650 @@
+"""
+Structure Writer
+Materializes (path, is_folder) entries as real folders and files
+Shared by the tree and Excel structure generators
+"""
+
+import errno
+import hashlib
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; reflinks fall back to plain copies there
+    fcntl = None
+
+from content_templates import templates
+
+
+# Hidden folder under the output root that holds shared placeholder blobs
+STORE_DIR = ".structure_store"
+
+# ioctl request number for FICLONE (Linux reflink)
+FICLONE = 0x40049409
+
+LINK_MODES = (None, 'hardlink', 'reflink')
+
+# errno values meaning "this filesystem cannot link/clone here"
+_UNSUPPORTED_LINK_ERRORS = {
+    errno.EXDEV, errno.EPERM, errno.EINVAL, errno.ENOTTY, errno.ENOSYS,
+    errno.EOPNOTSUPP, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP),
+}
+
+
+# Snapshot passed to progress callbacks: items done out of total, items
+# per second so far and estimated seconds left (None until known)
+Progress = namedtuple('Progress', ['done', 'total', 'rate', 'eta'])
+
+
+class GenerationCancelled(Exception):
+    """
+    Raised when a CancelToken stops a run part-way.
+    
+    Carries what was finished before the cancel, in the same shape that
+    apply_plan() returns.
+    """
+    
+    def __init__(self, created_items, errors, stats):
+        super().__init__(f"Cancelled after {len(created_items)} items")
+        self.created_items = created_items
+        self.errors = errors
+        self.stats = stats
+
+
+class CancelToken:
+    """Thread-safe flag that asks a running generation to stop."""
+    
+    def __init__(self):
+        """Initialize an un-cancelled token."""
+        self._event = threading.Event()
+    
+    def cancel(self):
+        """Request cancellation; checked between items."""
+        self._event.set()
+    
+    @property
+    def cancelled(self):
+        """True once cancel() has been called."""
+        return self._event.is_set()
+
+
+class ProgressReporter:
+    """
+    Count finished items and pass Progress snapshots to a callback.
+    
+    The callback runs on the thread doing the work, at most once per
+    interval seconds plus once when the last item is done, so it may
+    do UI work (via a queue) without slowing generation down.
+    """
+    
+    def __init__(self, callback, total, interval=0.1):
+        """
+        Initialize the reporter.
+        
+        Args:
+            callback (callable): Receives a Progress, or None to only count
+            total (int): Number of items expected
+            interval (float): Minimum seconds between callbacks
+        """
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self._start = time.perf_counter()
+        self._last = 0.0
+    
+    def advance(self, count=1):
+        """Record count more finished items."""
+        self.done += count
+        if self.callback is None:
+            return
+        
+        now = time.perf_counter()
+        if self.done < self.total and now - self._last < self.interval:
+            return
+        self._last = now
+        
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate > 0 else None
+        self.callback(Progress(self.done, self.total, rate, eta))
+
+
+def format_progress(progress):
+    """
+    Return a one-line 'done/total, rate, ETA' summary of a Progress.
+    
+    A total of None means the size of the run is not known yet, e.g.
+    while a workbook is still being streamed; only done and rate are shown.
+    """
+    if progress.total is None:
+        return f"{progress.done} items, {progress.rate:,.0f} items/s"
+    eta = f"{progress.eta:.0f}s left" if progress.eta is not None else "ETA unknown"
+    return f"{progress.done}/{progress.total} items, {progress.rate:,.0f} items/s, {eta}"
+
+
+class BlobStore:
+    """
+    Content-addressed store that placeholder files are linked from.
+    
+    Each distinct content blob is written once to
+    <base_path>/.structure_store/<sha1> and every target file is then
+    hardlinked to it, or reflinked (FICLONE, then copy_file_range) so
+    the filesystem can share the data blocks copy-on-write.
+    
+    Note that hardlinked files share one inode: editing one in place
+    changes all of them. Reflinked files do not have that problem.
+    """
+    
+    def __init__(self, base_path, link_mode):
+        """
+        Initialize the store.
+        
+        Args:
+            base_path (str): Output root; the store lives inside it
+            link_mode (str): 'hardlink' or 'reflink'
+        """
+        if link_mode not in ('hardlink', 'reflink'):
+            raise ValueError(f"Unknown link mode: {link_mode}")
+        
+        self.root = os.path.join(base_path, STORE_DIR)
+        self.link_mode = link_mode
+        self.enabled = True
+        self.stats = {'blobs': 0, 'links': 0, 'fallback_writes': 0}
+        self._blobs = {}
+        self._lock = threading.Lock()
+    
+    def place(self, item_path, content, mode):
+        """
+        Create item_path with content, sharing storage when possible.
+        
+        Falls back to a normal write, and disables linking for the rest
+        of the run, when the filesystem does not support it.
+        
+        Args:
+            item_path (str): File to create
+            content (bytes): File content
+            mode (str): 'xb' to keep existing files, 'wb' to replace them
+        """
+        if self.enabled:
+            try:
+                if self.link_mode == 'hardlink':
+                    shared = self._hardlink(item_path, content, mode)
+                else:
+                    shared = self._reflink(item_path, content, mode)
+                self._count('links' if shared else 'fallback_writes')
+                return
+            except FileExistsError:
+                raise
+            except (AttributeError, NotImplementedError):
+                self.enabled = False
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_LINK_ERRORS:
+                    raise
+                self.enabled = False
+        
+        with open(item_path, mode) as f:
+            f.write(content)
+        self._count('fallback_writes')
+    
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+    
+    @staticmethod
+    def _holds(blob_path, content):
+        """Return True if the file at blob_path has exactly content."""
+        try:
+            if os.path.getsize(blob_path) != len(content):
+                return False
+            with open(blob_path, 'rb') as f:
+                return f.read() == content
+        except OSError:
+            return False
+    
+    def _blob(self, content, refresh=False):
+        """
+        Return the store path for content, writing the blob once per run.
+        
+        A blob left by an earlier run is only reused if its bytes still
+        match: hardlinked outputs share its inode, so editing one of them
+        in place edits the blob too. A stale blob is replaced by a fresh
+        file (new inode), leaving the edited outputs as they are.
+        """
+        with self._lock:
+            blob_path = self._blobs.get(content)
+            if blob_path is not None and not refresh:
+                return blob_path
+            
+            os.makedirs(self.root, exist_ok=True)
+            digest = hashlib.sha1(content).hexdigest()
+            blob_path = os.path.join(self.root, digest)
+            if refresh:
+                # Too many links to the old blob; start a new copy
+                blob_path = f"{blob_path}.{self.stats['blobs']}"
+            if refresh or not self._holds(blob_path, content):
+                temp_path = f"{blob_path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(temp_path, blob_path)
+                self.stats['blobs'] += 1
+            
+            self._blobs[content] = blob_path
+            return blob_path
+    
+    def _hardlink(self, item_path, content, mode):
+        """Hardlink item_path to the blob; returns True."""
+        blob_path = self._blob(content)
+        try:
+            os.link(blob_path, item_path)
+        except FileExistsError:
+            if mode == 'xb':
+                raise
+            os.unlink(item_path)
+            os.link(blob_path, item_path)
+        except OSError as e:
+            if e.errno != errno.EMLINK:
+                raise
+            os.link(self._blob(content, refresh=True), item_path)
+        return True
+    
+    def _reflink(self, item_path, content, mode):
+        """
+        Clone the blob into item_path.
+        
+        Returns:
+            bool: True if the data was cloned or copied in-kernel, False if
+                  the content had to be written from Python
+        """
+        blob_path = self._blob(content)
+        with open(blob_path, 'rb') as src, open(item_path, mode) as dst:
+            if fcntl is not None:
+                try:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                    return True
+                except OSError:
+                    pass
+            
+            # copy_file_range lets NFS 4.2, btrfs and XFS share or copy
+            # server-side; otherwise write the bytes we already have
+            try:
+                remaining = len(content)
+                while remaining:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return True
+            except (AttributeError, OSError):
+                pass
+            
+            dst.seek(0)
+            dst.truncate()
+            dst.write(content)
+            return False
+
+
+def new_stats():
+    """Return a fresh syscall counter dictionary."""
+    return {'scandir': 0, 'mkdir': 0, 'makedirs': 0, 'open': 0}
+
+
+def plan_structure(entries, known_dirs=None):
+    """
+    Turn (path, is_folder) entries into an ordered list of operations.
+    
+    Folders are listed once, before anything inside them. Parents that
+    the entries only imply (e.g. 'a' for 'a/b.txt') get their own folder
+    operation, so applying the plan never needs os.makedirs().
+    
+    Args:
+        entries (iterable): (path, is_folder) or (path, is_folder, content)
+                            tuples with '/'-separated relative paths
+        known_dirs (set): Folders already planned by an earlier call; they
+                          are not listed again, and the set is updated
+                          with the folders of this plan
+    
+    Returns:
+        list: ('folder' | 'file', path, content) tuples; content is None
+              for folders and for files that use the placeholder body
+    """
+    operations = []
+    if known_dirs is None:
+        known_dirs = set()
+    known_dirs.add('')
+    
+    for entry in entries:
+        path, is_folder = entry[0], entry[1]
+        parent = path.rpartition('/')[0]
+        
+        if parent not in known_dirs:
+            missing = []
+            while parent not in known_dirs:
+                missing.append(parent)
+                known_dirs.add(parent)
+                parent = parent.rpartition('/')[0]
+            for folder in reversed(missing):
+                operations.append(('folder', folder, None))
+        
+        if is_folder:
+            if path not in known_dirs:
+                known_dirs.add(path)
+                operations.append(('folder', path, None))
+        else:
+            operations.append(('file', path, entry[2] if len(entry) > 2 else None))
+    
+    return operations
+
+
+def diff_plan(base_path, operations, stats=None):
+    """
+    Drop the operations whose target already exists under base_path.
+    
+    The target is read with one os.scandir() sweep that only descends
+    into folders the plan mentions, so checking a plan costs one
+    directory listing per existing folder instead of a stat per item.
+    
+    Args:
+        base_path (str): Folder the plan will be applied to
+        operations (list): Output of plan_structure()
+        stats (dict): Optional counters; 'scandir' is incremented
+    
+    Returns:
+        list: The operations that still need to run, in plan order
+    """
+    if not os.path.isdir(base_path):
+        return list(operations)
+    
+    planned = {path: kind for kind, path, _ in operations}
+    existing = {}
+    pending = ['']
+    
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(os.path.join(base_path, folder) if folder else base_path) as it:
+                for entry in it:
+                    path = f"{folder}/{entry.name}" if folder else entry.name
+                    kind = planned.get(path)
+                    if kind is None:
+                        continue
+                    is_dir = entry.is_dir()
+                    existing[path] = is_dir
+                    if is_dir and kind == 'folder':
+                        pending.append(path)
+        except OSError:
+            continue
+        if stats is not None:
+            stats['scandir'] += 1
+    
+    # A folder counts as present only if it is a directory; anything
+    # already at a file's path is left alone
+    return [
+        operation for operation in operations
+        if operation[1] not in existing
+        or (operation[0] == 'folder' and not existing[operation[1]])
+    ]
+
+
+def apply_plan(base_path, operations, source="tree structure", workers=1, overwrite=False,
+               stats=None, link_mode=None, progress=None, cancel=None):
+    """
+    Run planned operations under base_path.
+    
+    Every folder is created with a single os.mkdir(); files are opened
+    directly because the plan lists their parents first. With workers > 1
+    the folder skeleton is created first on the calling thread, then the
+    files are written through a bounded thread pool. The returned lists
+    keep plan order either way.
+    
+    Args:
+        base_path (str): Folder to create the structure in
+        operations (list): Output of plan_structure() or diff_plan()
+        source (str): Origin named in the placeholder content
+                      (see content_templates)
+        workers (int): Number of file-writing threads (1 = no pool)
+        overwrite (bool): Replace existing files; if False they are
+                          left untouched and not reported as created
+        stats (dict): Counters to add to (default: a new one)
+        link_mode (str): None to write every file, or 'hardlink' /
+                         'reflink' to store each distinct placeholder
+                         once and link it into place (see BlobStore);
+                         placeholders then use the shared template body
+        progress (callable): Called with a Progress as items finish
+        cancel (CancelToken): Checked between items
+    
+    Returns:
+        tuple: (created_items, errors, stats) where created_items is a
+               list of ('folder' | 'file', relative_path), errors is a
+               list of (relative_path, message) and stats counts the
+               filesystem calls made
+    
+    Raises:
+        GenerationCancelled: If cancel was triggered; it carries the
+                             items finished before that
+    """
+    if stats is None:
+        stats = new_stats()
+    errors = {}
+    file_jobs = []
+    mode = 'wb' if overwrite else 'xb'
+    store = BlobStore(base_path, link_mode) if link_mode else None
+    reporter = ProgressReporter(progress, len(operations))
+    finished = bytearray(len(operations))
+    
+    os.makedirs(base_path, exist_ok=True)
+    stats['makedirs'] += 1
+    
+    for position, (kind, path, content) in enumerate(operations):
+        if cancel is not None and cancel.cancelled:
+            break
+        
+        item_path = os.path.join(base_path, os.path.normpath(path))
+        
+        if kind == 'folder':
+            try:
+                os.mkdir(item_path)
+            except FileExistsError:
+                # An existing folder is kept but not counted as created;
+                # an empty message leaves it out of the error list too
+                errors[position] = '' if os.path.isdir(item_path) else f"A file already exists at {path}"
+            except OSError as e:
+                errors[position] = str(e)
+            stats['mkdir'] += 1
+            finished[position] = 1
+            reporter.advance()
+            continue
+        
+        if content is None:
+            content = templates.render(path.rpartition('/')[2], source, per_file=store is None)
+        if workers > 1:
+            file_jobs.append((position, item_path, content))
+        else:
+            errors.update(_write_file(position, item_path, content, mode, store))
+            finished[position] = 1
+            reporter.advance()
+        stats['open'] += 1
+    
+    if file_jobs:
+        errors.update(_write_files_parallel(file_jobs, mode, workers, store, finished, reporter, cancel))
+    
+    if store is not None:
+        stats.update(store.stats)
+    
+    created_items = [
+        (kind, os.path.normpath(path))
+        for position, (kind, path, _) in enumerate(operations)
+        if finished[position] and position not in errors
+    ]
+    error_items = [
+        (os.path.normpath(operations[position][1]), errors[position])
+        for position in sorted(errors) if errors[position]
+    ]
+    
+    if cancel is not None and cancel.cancelled and reporter.done < len(operations):
+        raise GenerationCancelled(created_items, error_items, stats)
+    
+    return created_items, error_items, stats
+
+
+def write_plan(sink, operations, source="tree structure", stats=None, progress=None, cancel=None):
+    """
+    Stream planned operations into an output sink instead of the disk.
+    
+    Entries are written one after another in plan order, so an archive
+    sink produces the whole structure as a single sequential write.
+    
+    Args:
+        sink (OutputSink): Destination, e.g. output_sinks.ZipSink
+        operations (list): Output of plan_structure()
+        source (str): Origin named in the placeholder content
+        stats (dict): Counters to add to (default: a new one)
+        progress (callable): Called with a Progress as entries are written
+        cancel (CancelToken): Checked between entries
+    
+    Returns:
+        tuple: (created_items, errors, stats) like apply_plan(); errors
+               is always empty because a failing sink write aborts
+    
+    Raises:
+        GenerationCancelled: If cancel was triggered
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('entries', 0)
+    created_items = []
+    reporter = ProgressReporter(progress, len(operations))
+    
+    for kind, path, content in operations:
+        if cancel is not None and cancel.cancelled:
+            raise GenerationCancelled(created_items, [], stats)
+        
+        if kind == 'folder':
+            sink.add_folder(path)
+        else:
+            if content is None:
+                content = templates.render(path.rpartition('/')[2], source)
+            if not sink.add_file(path, content):
+                reporter.advance()
+                continue
+        created_items.append((kind, path))
+        stats['entries'] += 1
+        reporter.advance()
+    
+    return created_items, [], stats
+
+
+def materialize(base_path, entries, source="tree structure", workers=1, overwrite=False,
+                link_mode=None, sink=None, progress=None, cancel=None, known_dirs=None):
+    """
+    Plan, diff and apply entries in one call.
+    
+    Unless overwrite is set, the plan is first diffed against base_path,
+    so regenerating an existing structure only creates what is missing.
+    With a sink the plan is streamed into it instead (see write_plan)
+    and nothing is written under base_path.
+    
+    Args:
+        base_path (str): Folder to create the structure in; ignored when
+                         sink is given
+        entries (iterable): (path, is_folder) or (path, is_folder, content)
+                            tuples, parents before children
+        source (str): Origin named in the placeholder content
+                      (see content_templates)
+        workers (int): Number of file-writing threads (1 = no pool)
+        overwrite (bool): Rewrite every file instead of skipping
+                          the ones that already exist
+        link_mode (str): None, 'hardlink' or 'reflink' (see apply_plan)
+        sink (OutputSink): Optional archive sink (see output_sinks)
+        progress (callable): Called with a Progress as items finish;
+                             the total counts only items still to create
+        cancel (CancelToken): Checked between items
+        known_dirs (set): Folders emitted by earlier calls, shared across
+                          calls to skip them (see plan_structure)
+    
+    Returns:
+        tuple: (created_items, errors, stats) as returned by apply_plan()
+    
+    Raises:
+        GenerationCancelled: If cancel was triggered
+    """
+    if sink is not None:
+        return write_plan(sink, plan_structure(entries, known_dirs), source, progress=progress, cancel=cancel)
+    
+    stats = new_stats()
+    operations = plan_structure(entries, known_dirs)
+    if not overwrite:
+        operations = diff_plan(base_path, operations, stats)
+    return apply_plan(base_path, operations, source, workers, overwrite, stats, link_mode,
+                      progress, cancel)
+
+
+def _write_file(position, item_path, content, mode, store=None):
+    """
+    Write one file, through store when linking is enabled.
+    
+    Returns:
+        dict: {} on success, {position: message} on failure; an existing
+              file in 'xb' mode counts as skipped and is reported as ''
+    """
+    try:
+        if store is not None:
+            store.place(item_path, content, mode)
+        else:
+            with open(item_path, mode) as f:
+                f.write(content)
+    except FileExistsError:
+        return {position: ''}
+    except OSError as e:
+        return {position: str(e)}
+    return {}
+
+
+def _write_files_parallel(file_jobs, mode, workers, store=None, finished=None, reporter=None,
+                          cancel=None):
+    """
+    Write files through a thread pool with a bounded submission window.
+    
+    At most workers * 4 writes are queued at a time, so memory does not
+    grow with the number of files, and a cancel only has to wait for
+    that many writes to drain. Completed positions are flagged in
+    finished and counted on reporter.
+    
+    Returns:
+        dict: {position: message} for the files that failed
+    """
+    errors = {}
+    window = workers * 4
+    pending = deque()
+    
+    def collect():
+        position, result = pending.popleft()
+        errors.update(result.result())
+        if finished is not None:
+            finished[position] = 1
+        if reporter is not None:
+            reporter.advance()
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for position, item_path, content in file_jobs:
+            if cancel is not None and cancel.cancelled:
+                break
+            pending.append((position, executor.submit(_write_file, position, item_path, content, mode, store)))
+            if len(pending) >= window:
+                collect()
+        
+        while pending:
+            collect()
+    
+    return errors
+
+
+def format_stats(stats):
+    """Return a one-line summary of syscall counts."""
+    return ", ".join(f"{name}: {count}" for name, count in stats.items())
@@ -0,0 +1,296 @@
+"""
+Tree Line Lexer
+Shared tokenizer for tree structure text (├──, │, └── or plain indentation)
+Used by simple_tree_generator.py and tree_structure_generator.py
+"""
+
+import re
+
+
+# Characters that may appear before an item name in a tree line.
+# Connectors (├──, └──), pipes (│) and indentation are all made of these,
+# so a single lstrip() separates the prefix from the name in one C-level scan.
+TREE_PREFIX_CHARS = ' │├└─'
+
+# Slow path for prefixes with other whitespace, e.g. the non-breaking
+# spaces GNU tree and pasted web listings indent with ('│\xa0\xa0 ├── ')
+TREE_PREFIX = re.compile(r'[\s│├└─]*')
+
+
+def iter_lines(text):
+    """Yield the lines of text without building an intermediate list."""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def lex_line(line):
+    """
+    Split a tree line into its depth column and item name.
+    
+    Example: '│   ├── main.py' -> (8, 'main.py')
+    
+    Args:
+        line (str): One line of tree text
+    
+    Returns:
+        tuple: (column, name), or None for blank lines
+    """
+    if '\t' in line:
+        line = line.expandtabs(4)
+    
+    stripped = line.lstrip(TREE_PREFIX_CHARS)
+    if stripped[:1].isspace():
+        stripped = line[TREE_PREFIX.match(line).end():]
+    name = stripped.rstrip()
+    if not name:
+        return None
+    
+    return len(line) - len(stripped), name
+
+
+def iter_tree_items(tree_source):
+    """
+    Lazily parse a tree structure, one line at a time.
+    
+    The depth of each item is the column where its name starts, so both
+    the ├── / └── / │ prefixes and plain indentation work. A stack of
+    (column, path) pairs holds the ancestors of the current line; it is
+    the only state kept between lines.
+    
+    Args:
+        tree_source (str or iterable): Tree text, or any iterable of
+                                       lines such as an open file
+    
+    Yields:
+        tuple: (path, is_folder) for every item, parents first
+    """
+    if isinstance(tree_source, str):
+        tree_source = iter_lines(tree_source)
+    
+    stack = []
+    
+    for line in tree_source:
+        token = lex_line(line)
+        if token is None:
+            continue
+        
+        column, name = token
+        is_folder = name.endswith('/')
+        name = name.rstrip('/')
+        if not name:
+            continue
+        
+        # Pop siblings and deeper items; what remains are ancestors
+        while stack and stack[-1][0] >= column:
+            stack.pop()
+        
+        path = f"{stack[-1][1]}/{name}" if stack else name
+        stack.append((column, path))
+        yield path, is_folder
+
+
+class _LineState:
+    """Parse state of one non-blank line: its token, parent line and path."""
+    
+    __slots__ = ('column', 'name', 'is_folder', 'parent', 'path')
+    
+    def __init__(self, column, name, is_folder):
+        self.column = column
+        self.name = name
+        self.is_folder = is_folder
+        self.parent = None
+        self.path = None
+
+
+def _lex_state(line):
+    """Lex a line into a _LineState, or None if it holds no item."""
+    token = lex_line(line)
+    if token is None:
+        return None
+    
+    column, name = token
+    is_folder = name.endswith('/')
+    name = name.rstrip('/')
+    if not name:
+        return None
+    return _LineState(column, name, is_folder)
+
+
+def _common_prefix_length(a, b, block=65536):
+    """Length of the common prefix of two strings, compared in blocks."""
+    limit = min(len(a), len(b))
+    start = 0
+    while start < limit and a[start:start + block] == b[start:start + block]:
+        start += block
+    if start >= limit:
+        return limit
+    
+    end = min(start + block, limit)
+    while start < end and a[start] == b[start]:
+        start += 1
+    return start
+
+
+def _common_suffix_length(a, b, limit, block=65536):
+    """Length of the common suffix of two strings, at most limit chars."""
+    length = 0
+    len_a, len_b = len(a), len(b)
+    while length < limit:
+        size = min(block, limit - length)
+        if a[len_a - length - size:len_a - length] != b[len_b - length - size:len_b - length]:
+            break
+        length += size
+    else:
+        return limit
+    
+    while length < limit and a[len_a - length - 1] == b[len_b - length - 1]:
+        length += 1
+    return length
+
+
+class IncrementalTreeParser:
+    """
+    Keep a tree text parsed, reparsing only what an edit touches.
+    
+    Every line of the text has an entry: None for blank lines, otherwise
+    a _LineState holding the lexed token, a reference to its parent
+    line's state and its full path. Parents are object references, not
+    line numbers, so inserting or deleting lines never invalidates the
+    links of the lines around the edit.
+    
+    set_text() finds the changed line range by diffing against the last
+    text, re-lexes just those lines, and then re-resolves parents from
+    the first changed line onwards. It stops at the first line past the
+    edit whose parent and path come out the same as before while no
+    re-parented line is among its ancestors: the ancestor stack is then
+    identical to the old one, so nothing below can change.
+    Editing a leaf touches one line; renaming a folder touches its
+    subtree.
+    """
+    
+    def __init__(self):
+        """Initialize an empty document."""
+        self.text = ''
+        self.lines = [None]
+        self.folders = 0
+        self.files = 0
+    
+    @property
+    def counts(self):
+        """(folders, files) for the current text."""
+        return self.folders, self.files
+    
+    def set_text(self, text):
+        """
+        Bring the parse up to date with text.
+        
+        Args:
+            text (str): The full, current tree text
+        
+        Returns:
+            int: Number of lines whose parse state was recomputed
+        """
+        old = self.text
+        if text == old:
+            return 0
+        
+        prefix = _common_prefix_length(old, text)
+        suffix = _common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+        
+        # Whole lines covering the change, in old and new numbering
+        first = old.count('\n', 0, prefix)
+        old_last = first + old.count('\n', prefix, len(old) - suffix)
+        
+        start_char = text.rfind('\n', 0, prefix) + 1
+        end_char = text.find('\n', len(text) - suffix)
+        if end_char == -1:
+            end_char = len(text)
+        
+        self.text = text
+        return self._splice(first, old_last + 1, text[start_char:end_char].split('\n'))
+    
+    def items(self):
+        """
+        Return every item in text order.
+        
+        Returns:
+            list: (path, is_folder) tuples, as iter_tree_items() yields them
+        """
+        return [(state.path, state.is_folder) for state in self.lines if state is not None]
+    
+    def _splice(self, start, end, new_lines):
+        """Replace lines[start:end] with new_lines and re-resolve parents."""
+        lines = self.lines
+        
+        for state in lines[start:end]:
+            if state is not None:
+                if state.is_folder:
+                    self.folders -= 1
+                else:
+                    self.files -= 1
+        
+        new_states = [_lex_state(line) for line in new_lines]
+        for state in new_states:
+            if state is not None:
+                if state.is_folder:
+                    self.folders += 1
+                else:
+                    self.files += 1
+        
+        lines[start:end] = new_states
+        edited_end = start + len(new_states)
+        stack = self._ancestors_before(start)
+        
+        # ids of stacked lines that are new or got a different parent;
+        # while any is on the stack, later lines may resolve differently
+        moved = set()
+        
+        index = start
+        total = len(lines)
+        while index < total:
+            state = lines[index]
+            if state is None:
+                index += 1
+                continue
+            
+            column = state.column
+            while stack and stack[-1].column >= column:
+                moved.discard(id(stack.pop()))
+            parent = stack[-1] if stack else None
+            path = f"{parent.path}/{state.name}" if parent is not None else state.name
+            
+            if index >= edited_end and state.parent is parent:
+                if not moved and state.path == path:
+                    break
+            else:
+                moved.add(id(state))
+            
+            state.parent = parent
+            state.path = path
+            stack.append(state)
+            index += 1
+        
+        return index - start
+    
+    def _ancestors_before(self, index):
+        """Return the ancestor stack in effect just before line index."""
+        lines = self.lines
+        index -= 1
+        while index >= 0 and lines[index] is None:
+            index -= 1
+        if index < 0:
+            return []
+        
+        stack = []
+        state = lines[index]
+        while state is not None:
+            stack.append(state)
+            state = state.parent
+        stack.reverse()
+        return stack
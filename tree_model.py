@@ -0,0 +1,286 @@
+"""
+Compact Tree Model
+Array-backed trie used to hold parsed folder/file structures
+"""
+
+import sys
+from array import array
+
+
+class CompactTree:
+    """
+    Folder/file hierarchy stored as parallel arrays.
+    
+    Every node is an integer index. Node 0 is an unnamed root; the other
+    nodes hold an interned name plus parent, first-child, last-child and
+    next-sibling links in array('i') columns and a folder flag in a
+    bytearray. That costs a few dozen bytes per node instead of the two
+    dicts per node of the old {'_is_folder', '_children'} layout.
+    
+    Children keep their insertion order. A (parent, name) -> node index
+    is kept while the tree is being built; freeze() drops it once the
+    tree is complete. remove() only unlinks a subtree; its node indexes
+    stay allocated and are never reused.
+    """
+    
+    __slots__ = ('names', 'parent', 'first_child', 'last_child',
+                 'next_sibling', 'is_folder', '_index', '_removed', '_removed_folders')
+    
+    ROOT = 0
+    NONE = -1
+    
+    def __init__(self):
+        """Initialize an empty tree containing only the root."""
+        self.names = ['']
+        self.parent = array('i', [self.NONE])
+        self.first_child = array('i', [self.NONE])
+        self.last_child = array('i', [self.NONE])
+        self.next_sibling = array('i', [self.NONE])
+        self.is_folder = bytearray(b'\x01')
+        self._index = {}
+        self._removed = 0
+        self._removed_folders = 0
+    
+    def __len__(self):
+        """Number of items, not counting the root."""
+        return len(self.names) - 1 - self._removed
+    
+    def add_path(self, path, is_folder):
+        """
+        Add a slash-separated path, creating missing parents as folders.
+        
+        Args:
+            path (str): Relative path such as 'Project/src/main.py'
+            is_folder (bool): Whether the last part is a folder
+        
+        Returns:
+            int: Node index of the last part
+        """
+        index = self._index
+        if index is None:
+            index = self._rebuild_index()
+        
+        parts = path.split('/')
+        last = len(parts) - 1
+        node = self.ROOT
+        
+        for i, part in enumerate(parts):
+            if not part:
+                continue
+            
+            folder = is_folder or i < last
+            child = index.get((node, part))
+            
+            if child is None:
+                child = self._append(node, part, folder)
+                index[(node, part)] = child
+            elif folder:
+                self.is_folder[child] = 1
+            
+            node = child
+        
+        return node
+    
+    def add_child(self, parent, name, is_folder):
+        """
+        Add a single child under a node, reusing one of the same name.
+        
+        Unlike add_path(), name is taken literally and may contain '/'.
+        
+        Args:
+            parent (int): Parent node index (ROOT for a top-level item)
+            name (str): Item name
+            is_folder (bool): Whether the item is a folder
+        
+        Returns:
+            int: Node index of the child
+        """
+        index = self._index
+        if index is None:
+            index = self._rebuild_index()
+        
+        child = index.get((parent, name))
+        if child is None:
+            child = self._append(parent, name, is_folder)
+            index[(parent, name)] = child
+        elif is_folder:
+            self.is_folder[child] = 1
+        return child
+    
+    def find(self, parent, name):
+        """Return the child of parent called name, or None."""
+        index = self._index
+        if index is None:
+            index = self._rebuild_index()
+        return index.get((parent, name))
+    
+    def remove(self, node):
+        """
+        Unlink a node and everything below it from the tree.
+        
+        Args:
+            node (int): Node index other than ROOT
+        """
+        parent = self.parent[node]
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        
+        # Find the previous sibling to splice node out of the chain
+        previous = self.NONE
+        child = first_child[parent]
+        while child != node:
+            previous = child
+            child = next_sibling[child]
+        
+        following = next_sibling[node]
+        if previous == self.NONE:
+            first_child[parent] = following
+        else:
+            next_sibling[previous] = following
+        if self.last_child[parent] == node:
+            self.last_child[parent] = previous
+        next_sibling[node] = self.NONE
+        
+        index = self._index
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            pending.extend(self.children(current))
+            if index is not None:
+                index.pop((self.parent[current], self.names[current]), None)
+            self.parent[current] = self.NONE
+            self._removed += 1
+            self._removed_folders += self.is_folder[current]
+    
+    def snapshot(self):
+        """
+        Return an independent copy of the tree.
+        
+        The columns are copied wholesale, so a snapshot is cheap to take
+        on a UI thread and can then be read from a worker thread while
+        the original keeps changing. The copy starts without an index.
+        
+        Returns:
+            CompactTree: The copy
+        """
+        copy = CompactTree.__new__(CompactTree)
+        copy.names = list(self.names)
+        copy.parent = self.parent[:]
+        copy.first_child = self.first_child[:]
+        copy.last_child = self.last_child[:]
+        copy.next_sibling = self.next_sibling[:]
+        copy.is_folder = bytearray(self.is_folder)
+        copy._index = None
+        copy._removed = self._removed
+        copy._removed_folders = self._removed_folders
+        return copy
+    
+    def _append(self, parent, name, is_folder):
+        """Append a new node as the last child of parent."""
+        node = len(self.names)
+        self.names.append(sys.intern(name))
+        self.parent.append(parent)
+        self.first_child.append(self.NONE)
+        self.last_child.append(self.NONE)
+        self.next_sibling.append(self.NONE)
+        self.is_folder.append(1 if is_folder else 0)
+        
+        previous = self.last_child[parent]
+        if previous == self.NONE:
+            self.first_child[parent] = node
+        else:
+            self.next_sibling[previous] = node
+        self.last_child[parent] = node
+        
+        return node
+    
+    def _rebuild_index(self):
+        """Recreate the (parent, name) lookup after freeze()."""
+        names = self.names
+        parent = self.parent
+        self._index = {(parent[node], names[node]): node for node in range(1, len(names))
+                       if parent[node] != self.NONE}
+        return self._index
+    
+    def freeze(self):
+        """
+        Drop the build-time lookup index to release its memory.
+        
+        The tree can still be extended afterwards; the index is rebuilt
+        on the next add_path().
+        
+        Returns:
+            CompactTree: self, for chaining
+        """
+        self._index = None
+        return self
+    
+    def children(self, node=ROOT):
+        """Yield the child node indexes of node in insertion order."""
+        child = self.first_child[node]
+        while child != self.NONE:
+            yield child
+            child = self.next_sibling[child]
+    
+    def path(self, node):
+        """Return the slash-separated path of node."""
+        parts = []
+        while node > self.ROOT:
+            parts.append(self.names[node])
+            node = self.parent[node]
+        return '/'.join(reversed(parts))
+    
+    def walk(self):
+        """
+        Walk the tree depth-first without recursion, parents first.
+        
+        Yields:
+            tuple: (node, path, depth) with depth 0 for top-level items
+        """
+        names = self.names
+        parent = self.parent
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        
+        prefixes = ['']
+        node = first_child[self.ROOT]
+        
+        while node != self.NONE:
+            base = prefixes[-1]
+            path = f"{base}/{names[node]}" if base else names[node]
+            yield node, path, len(prefixes) - 1
+            
+            child = first_child[node]
+            if child != self.NONE:
+                prefixes.append(path)
+                node = child
+                continue
+            
+            # Climb until an ancestor has a following sibling
+            while next_sibling[node] == self.NONE:
+                node = parent[node]
+                if node <= self.ROOT:
+                    return
+                prefixes.pop()
+            node = next_sibling[node]
+    
+    def iter_paths(self):
+        """
+        Yield every item in depth-first order, parents first.
+        
+        Yields:
+            tuple: (path, is_folder)
+        """
+        is_folder = self.is_folder
+        for node, path, _ in self.walk():
+            yield path, bool(is_folder[node])
+    
+    def counts(self):
+        """
+        Count folders and files.
+        
+        Returns:
+            tuple: (folders, files)
+        """
+        folders = self.is_folder.count(1) - 1 - self._removed_folders
+        return folders, len(self) - folders
@@ -0,0 +1,161 @@
+"""
+Tree Structure Core
+Parses tree structures (text format) and creates the matching files/folders
+Free of GUI imports so it can run on headless machines
+"""
+
+from tree_lexer import IncrementalTreeParser, iter_tree_items
+from tree_model import CompactTree
+from structure_writer import GenerationCancelled, diff_plan, materialize, plan_structure
+
+
+class TreeStructureParser:
+    """Parse and create file structures from tree representation."""
+    
+    def __init__(self):
+        """Initialize the parser."""
+        self.structure = []
+        self.counts = (0, 0)
+        self.document = IncrementalTreeParser()
+        self.last_stats = None
+        self.last_errors = []
+        
+    def parse_tree(self, tree_text):
+        """
+        Parse tree structure from text.
+        
+        Supports formats like:
+        Project/
+        ├── src/
+        │   ├── main.py
+        │   └── utils.py
+        ├── tests/
+        │   └── test_main.py
+        └── README.md
+        
+        Folder and file totals are counted while parsing and kept in
+        self.counts as (folders, files).
+        
+        Args:
+            tree_text (str): Tree structure as text
+            
+        Returns:
+            list: List of tuples (path, is_folder) with full paths,
+                  e.g. ('Project/src/main.py', False)
+        """
+        structure = []
+        append = structure.append
+        folders = 0
+        
+        for item in self.iter_parse(tree_text):
+            append(item)
+            folders += item[1]
+        
+        self.structure = structure
+        self.counts = (folders, len(structure) - folders)
+        return structure
+    
+    def update_text(self, tree_text):
+        """
+        Re-parse tree text incrementally after an edit.
+        
+        Only the lines that changed since the previous call, plus the
+        lines whose parent they affect, are tokenized again; structure
+        and counts are then refreshed from the kept per-line state.
+        
+        Args:
+            tree_text (str): The full, current tree text
+            
+        Returns:
+            int: Number of lines that were re-parsed (0 = no change)
+        """
+        reparsed = self.document.set_text(tree_text)
+        if reparsed or not self.structure:
+            self.structure = self.document.items()
+            self.counts = self.document.counts
+        return reparsed
+    
+    def iter_parse(self, tree_source):
+        """
+        Lazily parse a tree structure, one line at a time.
+        
+        Args:
+            tree_source (str or iterable): Tree text, or any iterable of
+                                           lines such as an open file
+            
+        Yields:
+            tuple: (path, is_folder) for every item, parents first
+        """
+        return iter_tree_items(tree_source)
+    
+    def build_hierarchical_structure(self):
+        """
+        Build hierarchical structure from flat list.
+        
+        Returns:
+            CompactTree: Hierarchical structure
+        """
+        hierarchy = CompactTree()
+        
+        for path, is_folder in self.structure:
+            hierarchy.add_path(path, is_folder)
+        
+        return hierarchy.freeze()
+    
+    def plan(self, base_path=None):
+        """
+        Turn the parsed structure into a list of create operations.
+        
+        Args:
+            base_path (str): If given, operations whose target already
+                             exists there are left out
+            
+        Returns:
+            list: ('folder' | 'file', path, content) tuples, parents first
+        """
+        hierarchy = self.build_hierarchical_structure()
+        operations = plan_structure(hierarchy.iter_paths())
+        
+        if base_path is not None:
+            operations = diff_plan(base_path, operations)
+        
+        return operations
+    
+    def create_structure(self, base_path, workers=1, overwrite=False, link_mode=None, sink=None,
+                         progress=None, cancel=None):
+        """
+        Create actual files and folders from structure.
+        
+        The structure is planned, diffed against base_path with a single
+        directory sweep, and only the missing items are created, so
+        regenerating an existing tree is cheap. Each folder is created
+        exactly once. The syscall counts and per-item errors of the run
+        are kept in self.last_stats and self.last_errors.
+        
+        Args:
+            base_path (str): Base path to create structure
+            workers (int): Threads used to write files (1 = sequential)
+            overwrite (bool): Rewrite files that already exist
+            link_mode (str): None, 'hardlink' or 'reflink' to store each
+                             distinct placeholder once and link it into place
+            sink (OutputSink): Stream the structure into an archive
+                               (see output_sinks) instead of base_path
+            progress (callable): Called with a structure_writer.Progress
+                                 (done, total, rate, eta) as items finish
+            cancel (CancelToken): Stops the run between items; it then
+                                  raises GenerationCancelled
+            
+        Returns:
+            tuple: (created_count, created_items)
+        """
+        hierarchy = self.build_hierarchical_structure()
+        try:
+            created_items, self.last_errors, self.last_stats = materialize(
+                base_path, hierarchy.iter_paths(), workers=workers, overwrite=overwrite,
+                link_mode=link_mode, sink=sink, progress=progress, cancel=cancel
+            )
+        except GenerationCancelled as e:
+            self.last_errors, self.last_stats = e.errors, e.stats
+            raise
+        
+        return len(created_items), created_items
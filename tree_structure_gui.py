@@ -0,0 +1,463 @@
+"""
+Tree Structure GUI
+Tkinter front end for converting tree structures into files and folders
+"""
+
+import os
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from tkinter.scrolledtext import ScrolledText
+import threading
+
+from gui_support import MAX_WORKERS, LogChannel, ProgressPanel, VirtualRowView, read_workers
+from output_sinks import open_sink
+from structure_writer import GenerationCancelled, format_stats
+from tree_structure_core import TreeStructureParser
+
+
+class TreeStructureGUI:
+    """GUI for Tree Structure to Files conversion."""
+    
+    def __init__(self, root):
+        """Initialize the GUI."""
+        self.root = root
+        self.root.title("Tree Structure to Files Generator")
+        self.root.geometry("1200x700")
+        self.root.resizable(True, True)
+        
+        # Data storage
+        self.tree_text = None
+        self.output_path = None
+        self.parser = TreeStructureParser()
+        self._reparse_job = None
+        
+        # Setup GUI
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Setup the user interface."""
+        
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky="nsew")
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+        
+        # Header
+        header_frame = ttk.LabelFrame(main_frame, text="Configuration", padding="10")
+        header_frame.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+        header_frame.columnconfigure(1, weight=1)
+        
+        # Output path
+        ttk.Label(header_frame, text="Output Folder:").grid(row=0, column=0, sticky="w", padx=5)
+        self.output_path_label = ttk.Label(header_frame, text="No folder selected", foreground="gray")
+        self.output_path_label.grid(row=0, column=1, sticky="w", padx=5)
+        ttk.Button(header_frame, text="Browse Output", command=self.browse_output_folder).grid(row=0, column=2, padx=5)
+        
+        # Parallel file writing
+        ttk.Label(header_frame, text="Write Threads:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.workers_var = tk.StringVar(value="1")
+        ttk.Spinbox(header_frame, from_=1, to=MAX_WORKERS, textvariable=self.workers_var, width=5).grid(row=1, column=1, sticky="w", padx=5, pady=5)
+        
+        # Deduplicated placeholders
+        ttk.Label(header_frame, text="Deduplicate Files:").grid(row=2, column=0, sticky="w", padx=5)
+        self.link_mode = ttk.Combobox(header_frame, values=["off", "hardlink", "reflink"], state="readonly", width=10)
+        self.link_mode.set("off")
+        self.link_mode.grid(row=2, column=1, sticky="w", padx=5)
+        
+        # Notebook (tabs)
+        notebook = ttk.Notebook(main_frame)
+        notebook.grid(row=1, column=0, sticky="nsew", pady=10)
+        main_frame.rowconfigure(1, weight=1)
+        
+        # Tab 1: Tree Input
+        input_frame = ttk.Frame(notebook)
+        notebook.add(input_frame, text="Tree Structure Input")
+        self.setup_input_tab(input_frame)
+        
+        # Tab 2: Preview
+        preview_frame = ttk.Frame(notebook)
+        notebook.add(preview_frame, text="Structure Preview")
+        self.setup_preview_tab(preview_frame)
+        
+        # Tab 3: Output Log
+        log_frame = ttk.Frame(notebook)
+        notebook.add(log_frame, text="Output Log")
+        self.setup_log_tab(log_frame)
+        
+        # Footer with buttons
+        footer_frame = ttk.Frame(main_frame)
+        footer_frame.grid(row=2, column=0, sticky="ew", pady=10)
+        footer_frame.columnconfigure(0, weight=1)
+        
+        ttk.Button(footer_frame, text="Load from File", command=self.load_from_file).pack(side="left", padx=5)
+        ttk.Button(footer_frame, text="Parse Tree", command=self.parse_tree).pack(side="left", padx=5)
+        ttk.Button(footer_frame, text="Generate Structure", command=self.generate_structure_threaded).pack(side="left", padx=5)
+        ttk.Button(footer_frame, text="Export as Archive", command=self.export_archive_threaded).pack(side="left", padx=5)
+        ttk.Button(footer_frame, text="Save Tree as Text", command=self.save_tree_text).pack(side="left", padx=5)
+        
+        self.status_var = tk.StringVar(value="Ready")
+        status_bar = ttk.Label(footer_frame, textvariable=self.status_var, relief="sunken", anchor="w")
+        status_bar.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        
+        # Progress of the running generation
+        self.progress_panel = ProgressPanel(main_frame, self.log_channel)
+        self.progress_panel.grid(row=3, column=0, sticky="ew")
+    
+    def setup_input_tab(self, parent):
+        """Setup the tree input tab."""
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(1, weight=1)
+        
+        # Instructions
+        instructions = ttk.Label(parent, text="Paste your tree structure here. Use ├──, │, └── for tree characters (or just use simple indentation).\nExample formats shown below.", wraplength=1000, justify="left")
+        instructions.grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        
+        # Text area
+        self.tree_input = ScrolledText(parent, wrap="word", height=30, width=100)
+        self.tree_input.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.tree_input.bind("<<Modified>>", self._on_input_modified)
+        
+        # Sample buttons
+        sample_frame = ttk.Frame(parent)
+        sample_frame.grid(row=2, column=0, sticky="ew", padx=5, pady=5)
+        
+        ttk.Button(sample_frame, text="Load Sample 1: Simple Project", 
+                  command=lambda: self.load_sample(1)).pack(side="left", padx=5)
+        ttk.Button(sample_frame, text="Load Sample 2: Deep Structure", 
+                  command=lambda: self.load_sample(2)).pack(side="left", padx=5)
+        ttk.Button(sample_frame, text="Load Sample 3: Document Structure", 
+                  command=lambda: self.load_sample(3)).pack(side="left", padx=5)
+    
+    def setup_preview_tab(self, parent):
+        """Setup the preview tab."""
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(1, weight=1)
+        
+        ttk.Label(parent, text="Parsed Structure Preview:", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky="nw", padx=5, pady=5)
+        
+        # Only the rows in view are drawn, so huge specs scroll smoothly
+        self.preview_view = VirtualRowView(parent, height=30, width=100)
+        self.preview_view.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        
+        self.preview_summary = ttk.Label(parent, text="Nothing parsed yet", foreground="gray")
+        self.preview_summary.grid(row=2, column=0, sticky="w", padx=5, pady=5)
+    
+    def setup_log_tab(self, parent):
+        """Setup the output log tab."""
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(0, weight=1)
+        
+        self.log_text = ScrolledText(parent, wrap="word", height=30, width=100)
+        self.log_text.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.log_channel = LogChannel(self.root, self.log_text)
+        
+        ttk.Button(parent, text="Clear Log", command=lambda: self.log_channel.clear()).grid(row=1, column=0, sticky="e", padx=5, pady=5)
+    
+    def log(self, message):
+        """Add message to log; safe to call from worker threads."""
+        self.log_channel.put(message)
+    
+    def browse_output_folder(self):
+        """Browse for output folder."""
+        folder_path = filedialog.askdirectory(title="Select Output Folder")
+        if folder_path:
+            self.output_path = folder_path
+            self.output_path_label.config(text=folder_path, foreground="black")
+            self.status_var.set(f"Output: {folder_path}")
+    
+    def load_sample(self, sample_num):
+        """Load a sample tree structure."""
+        samples = {
+            1: """MyProject/
+├── src/
+│   ├── main.py
+│   ├── utils.py
+│   └── config.py
+├── tests/
+│   ├── test_main.py
+│   └── test_utils.py
+├── docs/
+│   └── README.md
+└── requirements.txt""",
+            
+            2: """Company/
+├── Engineering/
+│   ├── Backend/
+│   │   ├── api/
+│   │   │   ├── routes.py
+│   │   │   └── handlers.py
+│   │   ├── database/
+│   │   │   └── models.py
+│   │   └── tests/
+│   │       └── test_api.py
+│   └── Frontend/
+│       ├── components/
+│       │   ├── Button.jsx
+│       │   └── Header.jsx
+│       └── pages/
+│           ├── Home.jsx
+│           └── About.jsx
+├── Sales/
+│   ├── 2024/
+│   │   ├── Q1/
+│   │   │   └── report.xlsx
+│   │   └── Q2/
+│   │       └── report.xlsx
+│   └── 2025/
+│       └── Q1/
+│           └── report.xlsx
+└── HR/
+    ├── Policies/
+    │   └── handbook.pdf
+    └── Training/
+        └── onboarding.pdf""",
+            
+            3: """DocumentArchive/
+├── 2024/
+│   ├── January/
+│   │   ├── invoices/
+│   │   │   ├── INV001.pdf
+│   │   │   └── INV002.pdf
+│   │   ├── contracts/
+│   │   │   └── contract_001.pdf
+│   │   └── reports/
+│   │       └── monthly_report.pdf
+│   ├── February/
+│   │   ├── invoices/
+│   │   │   └── INV003.pdf
+│   │   └── reports/
+│   │       └── monthly_report.pdf
+│   └── March/
+│       └── invoices/
+│           └── INV004.pdf
+└── 2025/
+    └── January/
+        ├── invoices/
+        └── reports/"""
+        }
+        
+        self.tree_input.delete("1.0", "end")
+        self.tree_input.insert("1.0", samples.get(sample_num, ""))
+        self.status_var.set(f"Loaded Sample {sample_num}")
+    
+    def load_from_file(self):
+        """Load tree structure from a text file."""
+        file_path = filedialog.askopenfilename(
+            title="Select Tree Structure File",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        
+        if file_path:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                self.tree_input.delete("1.0", "end")
+                self.tree_input.insert("1.0", content)
+                self.status_var.set(f"Loaded from: {os.path.basename(file_path)}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load file:\n{str(e)}")
+    
+    def _on_input_modified(self, event=None):
+        """Schedule a re-parse shortly after the user stops typing."""
+        if not self.tree_input.edit_modified():
+            return
+        self.tree_input.edit_modified(False)
+        
+        if self._reparse_job is not None:
+            self.root.after_cancel(self._reparse_job)
+        self._reparse_job = self.root.after(300, self.sync_parse)
+    
+    def sync_parse(self):
+        """
+        Bring the parsed model up to date with the input box.
+        
+        Only edited lines and the lines below them whose parent changes
+        are re-parsed, so this is cheap to call before every action.
+        
+        Returns:
+            list: The current (path, is_folder) structure
+        """
+        if self._reparse_job is not None:
+            self.root.after_cancel(self._reparse_job)
+            self._reparse_job = None
+        
+        self.parser.update_text(self.tree_input.get("1.0", "end-1c"))
+        return self.parser.structure
+    
+    def parse_tree(self):
+        """Show the parsed tree structure in the preview."""
+        try:
+            structure = self.sync_parse()
+            
+            if not structure:
+                messagebox.showwarning("Warning", "Please enter tree structure first!")
+                return
+            
+            folders, files = self.parser.counts
+            total = len(structure)
+            
+            # Rows are formatted on demand as they scroll into view
+            def preview_row(index):
+                path, is_folder = structure[index]
+                item_type = "📁 FOLDER" if is_folder else "📄 FILE"
+                return f"{index + 1}. {item_type}: {path}"
+            
+            self.preview_view.set_rows(total, preview_row)
+            self.preview_summary.config(
+                text=f"Total items: {total}    Folders: {folders}    Files: {files}", foreground="black"
+            )
+            
+            self.status_var.set(f"Parsed {total} items successfully")
+            messagebox.showinfo("Success", f"Parsed {total} items!\n\nFolders: {folders}\nFiles: {files}")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to parse tree:\n{str(e)}")
+            self.status_var.set("Error parsing tree")
+    
+    def generate_structure_threaded(self):
+        """Generate structure in a separate thread."""
+        if not self.sync_parse():
+            messagebox.showwarning("Warning", "Please enter tree structure first!")
+            return
+        
+        if not self.output_path:
+            messagebox.showwarning("Warning", "Please select output folder!")
+            return
+        
+        # Options are read here, on the Tk thread
+        workers = read_workers(self.workers_var)
+        link_mode = None if self.link_mode.get() == "off" else self.link_mode.get()
+        
+        self.progress_panel.start()
+        thread = threading.Thread(target=self.generate_structure, args=(None, workers, link_mode))
+        thread.start()
+    
+    def export_archive_threaded(self):
+        """Write the structure straight into a zip or tar archive."""
+        if not self.sync_parse():
+            messagebox.showwarning("Warning", "Please enter tree structure first!")
+            return
+        
+        archive_path = filedialog.asksaveasfilename(
+            title="Export Structure as Archive",
+            defaultextension=".zip",
+            filetypes=[("Zip Archive", "*.zip"), ("Tar Archive", "*.tar"),
+                       ("Gzipped Tar Archive", "*.tar.gz *.tgz"), ("All Files", "*.*")]
+        )
+        
+        if archive_path:
+            # Options are read here, on the Tk thread
+            workers = read_workers(self.workers_var)
+            link_mode = None if self.link_mode.get() == "off" else self.link_mode.get()
+            
+            self.progress_panel.start()
+            thread = threading.Thread(target=self.generate_structure, args=(archive_path, workers, link_mode))
+            thread.start()
+    
+    def generate_structure(self, archive_path=None, workers=1, link_mode=None):
+        """
+        Generate the file structure (runs on a worker thread).
+        
+        Uses the structure kept current by sync_parse(), so nothing is
+        parsed again here.
+        
+        Args:
+            archive_path (str): If given, write the structure into this
+                                .zip / .tar(.gz) file instead of the
+                                output folder
+            workers (int): Threads used to write files (1 = sequential)
+            link_mode (str): None, 'hardlink' or 'reflink'
+        """
+        progress = self.progress_panel.report
+        cancel = self.progress_panel.token
+        try:
+            target = archive_path or self.output_path
+            
+            self.log("\n" + "="*70)
+            self.log("Starting structure generation from tree...")
+            self.log(f"Output Path: {target}")
+            self.log("="*70)
+            
+            # Create structure
+            if archive_path:
+                with open_sink(archive_path) as sink:
+                    created_count, created_items = self.parser.create_structure(
+                        archive_path, sink=sink, progress=progress, cancel=cancel
+                    )
+            else:
+                created_count, created_items = self.parser.create_structure(
+                    self.output_path, workers=workers, link_mode=link_mode, progress=progress, cancel=cancel
+                )
+            
+            # Log results
+            self.log(f"\nCreated {created_count} items:\n")
+            for item_type, path in created_items:
+                icon = "📁" if item_type == "folder" else "📄"
+                self.log(f"{icon} {path}")
+            
+            for path, error in self.parser.last_errors:
+                self.log(f"✗ {path}: {error}")
+            
+            self.log("\n" + "="*70)
+            self.log(f"✓ Structure generation complete!")
+            self.log(f"  Total items created: {created_count}")
+            if self.parser.last_errors:
+                self.log(f"  Failed items: {len(self.parser.last_errors)}")
+            self.log(f"  Syscalls: {format_stats(self.parser.last_stats)}")
+            self.log("="*70 + "\n")
+            
+            if self.parser.last_errors:
+                self.log_channel.call(self.status_var.set, f"Created {created_count} items, {len(self.parser.last_errors)} failed")
+                self.log_channel.call(
+                    messagebox.showwarning, "Completed with Errors",
+                    f"Created {created_count} items in:\n{target}\n\n{len(self.parser.last_errors)} items failed; see the log for details."
+                )
+            else:
+                self.log_channel.call(self.status_var.set, f"Success! Created {created_count} items")
+                self.log_channel.call(messagebox.showinfo, "Success", f"Structure generated successfully!\n\nCreated {created_count} items in:\n{target}")
+            
+        except GenerationCancelled as e:
+            self.log(f"⚠ {e}; items already created were kept\n")
+            self.log_channel.call(self.status_var.set, str(e))
+        except Exception as e:
+            error_msg = f"✗ Error: {str(e)}\n"
+            self.log(error_msg)
+            self.log_channel.call(messagebox.showerror, "Error", f"Failed to generate structure:\n{str(e)}")
+            self.log_channel.call(self.status_var.set, "Error generating structure")
+        finally:
+            self.progress_panel.finish()
+    
+    def save_tree_text(self):
+        """Save tree structure to a text file."""
+        tree_text = self.tree_input.get("1.0", "end").strip()
+        
+        if not tree_text:
+            messagebox.showwarning("Warning", "Please enter tree structure first!")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        
+        if file_path:
+            try:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(tree_text)
+                messagebox.showinfo("Success", f"Tree structure saved to:\n{file_path}")
+                self.log(f"✓ Tree structure saved: {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save:\n{str(e)}")
+
+
+def main():
+    """Main function."""
+    root = tk.Tk()
+    app = TreeStructureGUI(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
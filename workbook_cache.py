@@ -0,0 +1,201 @@
+"""
+Workbook Cache
+On-disk cache of parsed workbooks for the Excel structure tools
+Tables are stored in a columnar (Feather) or binary (pickle) file keyed
+by the workbook's content hash, size and mtime, and evicted least
+recently used first once the cache grows past its size limit
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    # Optional; tables are pickled instead
+    feather = None
+
+from workbook_io import read_sheets, read_workbook
+
+
+# Bumped whenever the normalized table layout changes
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def default_cache_dir():
+    """Return the per-user cache folder ($XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'auto-dmc', 'workbooks')
+
+
+def file_digest(filepath, block=1024 * 1024):
+    """Return the BLAKE2b hex digest of a file's content."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(block), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WorkbookCache:
+    """
+    Directory of parsed workbook tables with LRU eviction by size.
+    
+    An entry is found by hashing the workbook together with its size,
+    mtime and the sheets that were read, so an edited file is simply a
+    miss. Hits touch the entry's mtime, which is what eviction orders
+    by. Pickled entries are only ever read back from this directory, so
+    it must not be writable by other users.
+    """
+    
+    def __init__(self, directory=None, max_bytes=DEFAULT_CACHE_BYTES):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory (str): Cache folder (default: default_cache_dir())
+            max_bytes (int): Total size kept after each store
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+    
+    def key(self, filepath, sheets=None, columns=None):
+        """
+        Build the cache key for a workbook and sheet/column selection.
+        
+        Args:
+            filepath (str): Path to the workbook
+            sheets (list): Sheet names read, or None for the first sheet
+            columns (list): Columns read, or None for all
+        
+        Returns:
+            str: Hex key
+        """
+        stat = os.stat(filepath)
+        parts = [str(CACHE_VERSION), file_digest(filepath), str(stat.st_size), str(stat.st_mtime_ns)]
+        parts.extend(sheets if sheets is not None else ['<first>'])
+        parts.extend(['<columns>'] + list(columns) if columns is not None else ['<all>'])
+        return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=20).hexdigest()
+    
+    def _paths(self, key):
+        return (os.path.join(self.directory, f"{key}.feather"),
+                os.path.join(self.directory, f"{key}.pkl"))
+    
+    def load(self, key):
+        """
+        Return the cached table for key, or None on a miss.
+        
+        Args:
+            key (str): Key from key()
+        
+        Returns:
+            pd.DataFrame: Object-dtype text columns, or None
+        """
+        feather_path, pickle_path = self._paths(key)
+        try:
+            if feather is not None and os.path.exists(feather_path):
+                frame = feather.read_feather(feather_path).astype(object)
+                os.utime(feather_path)
+                return frame
+            if os.path.exists(pickle_path):
+                with open(pickle_path, 'rb') as f:
+                    frame = pickle.load(f)
+                os.utime(pickle_path)
+                return frame
+        except Exception:
+            # A damaged entry is treated as a miss and rewritten later
+            return None
+        return None
+    
+    def store(self, key, frame):
+        """
+        Save a table under key, then evict down to max_bytes.
+        
+        Args:
+            key (str): Key from key()
+            frame (pd.DataFrame): Table to cache
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        feather_path, pickle_path = self._paths(key)
+        frame = frame.reset_index(drop=True)
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            target = pickle_path
+            if feather is not None:
+                try:
+                    feather.write_feather(frame, temp_path)
+                    target = feather_path
+                except Exception:
+                    # e.g. non-string column names; pickle handles those
+                    pass
+            if target == pickle_path:
+                with open(temp_path, 'wb') as f:
+                    pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, target)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        
+        self.evict()
+    
+    def evict(self):
+        """Delete least recently used entries until under max_bytes."""
+        try:
+            scanned = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        
+        entries = []
+        total = 0
+        for entry in scanned:
+            if not entry.name.endswith(('.feather', '.pkl')):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total += stat.st_size
+        
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+    
+    def read(self, filepath, sheets=None, columns=None):
+        """
+        Load a workbook through the cache.
+        
+        Args:
+            filepath (str): Path to the workbook
+            sheets (list): Sheets to stack under their own sub-roots (see
+                           workbook_io.read_sheets), or None for the first
+            columns (list): Only read these columns (default: all)
+        
+        Returns:
+            tuple: (pd.DataFrame, bool) - the table and whether it came
+                   from the cache
+        """
+        key = self.key(filepath, sheets, columns)
+        frame = self.load(key)
+        if frame is not None:
+            return frame, True
+        
+        if sheets is None:
+            frame = read_workbook(filepath, columns=columns)
+        else:
+            frame = read_sheets(filepath, sheets, columns=columns)
+        try:
+            self.store(key, frame)
+        except OSError:
+            # The cache is an optimisation; a read-only home is fine
+            pass
+        return frame, False
@@ -0,0 +1,331 @@
+"""
+Workbook I/O
+Streaming spreadsheet and table reader for the Excel structure tools
+Rows are read with openpyxl's read-only iterator (or a CSV/Parquet
+reader, picked by extension) and handed out in chunks of text-only
+DataFrames, so memory stays bounded by the chunk size rather than by
+the size of the sheet
+"""
+
+import csv
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    # Optional; pandas readers are used instead
+    pa = None
+
+
+# Rows per chunk handed to the planner
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Delimited text formats and their separators
+DELIMITED_SUFFIXES = {'.csv': ',', '.tsv': '\t', '.tab': '\t'}
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+# Everything iter_workbook_chunks() can read, for file dialogs
+SUPPORTED_SUFFIXES = ('.xlsx', '.xlsm', '.xls') + tuple(DELIMITED_SUFFIXES) + PARQUET_SUFFIXES
+
+
+def cell_text(value):
+    """
+    Convert a worksheet cell value to the text used in paths.
+    
+    Whole-number floats lose their '.0' (a Year of 2024 stays '2024'),
+    dates without a time keep only the date, and empty cells become ''.
+    
+    Args:
+        value: Cell value as returned by openpyxl
+    
+    Returns:
+        str: Stripped text
+    """
+    if type(value) is str:
+        return value.strip()
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time(0):
+        return value.date().isoformat()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def header_names(values):
+    """
+    Turn a header row into unique column names, pandas style.
+    
+    Blank headers become 'Unnamed: N' and repeats get '.1', '.2', ...
+    
+    Args:
+        values (iterable): Raw header cell values
+    
+    Returns:
+        list: Column names
+    """
+    names = []
+    seen = {}
+    for index, value in enumerate(values):
+        name = cell_text(value) or f"Unnamed: {index}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _suffix(filepath):
+    return os.path.splitext(filepath)[1].lower()
+
+
+def sheet_names(filepath):
+    """
+    List the sheets of a workbook in workbook order.
+    
+    CSV and Parquet files count as a single sheet named after the file.
+    
+    Args:
+        filepath (str): Path to a workbook or table file
+    
+    Returns:
+        list: Sheet names
+    """
+    suffix = _suffix(filepath)
+    if suffix in DELIMITED_SUFFIXES or suffix in PARQUET_SUFFIXES:
+        return [os.path.splitext(os.path.basename(filepath))[0]]
+    
+    if suffix == '.xls':
+        with pd.ExcelFile(filepath) as workbook:
+            return list(workbook.sheet_names)
+    
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(filepath, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _frame(rows, columns, start):
+    """Build a chunk DataFrame whose index continues from start."""
+    frame = pd.DataFrame(rows, columns=columns, dtype=object)
+    frame.index = pd.RangeIndex(start, start + len(rows))
+    return frame
+
+
+def text_frame(frame):
+    """
+    Convert a typed DataFrame to the text table the planner expects.
+    
+    Every distinct value of a column is converted once with cell_text(),
+    so typed readers (Parquet, .xls) give the same text as the workbook
+    reader, e.g. '2024' for a Year stored as 2024.0.
+    
+    Args:
+        frame (pd.DataFrame): Table of any dtypes
+    
+    Returns:
+        pd.DataFrame: Object-dtype text columns, same index
+    """
+    columns = {}
+    for position, name in enumerate(frame.columns):
+        codes, uniques = pd.factorize(frame.iloc[:, position])
+        # Code -1 (missing) picks the trailing ''
+        texts = np.array([cell_text(value) for value in uniques] + [''], dtype=object)
+        columns[position] = texts[codes]
+    
+    result = pd.DataFrame(columns, index=frame.index, dtype=object)
+    result.columns = header_names(frame.columns)
+    return result
+
+
+def _drop_blank_rows(frame):
+    return frame[(frame != '').any(axis=1)] if len(frame.columns) else frame
+
+
+def _iter_delimited_chunks(filepath, delimiter, chunk_size, columns):
+    """Read CSV/TSV as text, with pyarrow's reader when available."""
+    with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+        header = next(csv.reader(f, delimiter=delimiter), None)
+    if header is None:
+        yield pd.DataFrame()
+        return
+    names = header_names(header)
+    
+    if pa is not None:
+        reader = pa_csv.open_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in names},
+                include_columns=columns,
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False,
+            ),
+        )
+        start = 0
+        for batch in reader:
+            frame = batch.to_pandas().astype(object)
+            frame.index = pd.RangeIndex(start, start + len(frame))
+            start += len(frame)
+            yield _drop_blank_rows(frame.apply(lambda column: column.str.strip()).astype(object))
+        return
+    
+    chunks = pd.read_csv(
+        filepath, sep=delimiter, header=0, names=names, usecols=columns, dtype=str,
+        keep_default_na=False, na_filter=False, encoding='utf-8-sig', chunksize=chunk_size
+    )
+    for frame in chunks:
+        yield _drop_blank_rows(frame.apply(lambda column: column.str.strip()).astype(object))
+
+
+def _iter_parquet_chunks(filepath, chunk_size, columns):
+    """Read Parquet row groups in batches, converting values to text."""
+    if pa is not None:
+        start = 0
+        for batch in pq.ParquetFile(filepath).iter_batches(batch_size=chunk_size, columns=columns):
+            frame = batch.to_pandas()
+            frame.index = pd.RangeIndex(start, start + len(frame))
+            start += len(frame)
+            yield _drop_blank_rows(text_frame(frame))
+        return
+    
+    # pandas needs fastparquet here and raises ImportError without it
+    frame = pd.read_parquet(filepath, columns=columns)
+    for start in range(0, max(len(frame), 1), chunk_size):
+        yield _drop_blank_rows(text_frame(frame.iloc[start:start + chunk_size]))
+
+
+def iter_workbook_chunks(filepath, sheet_name=None, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """
+    Read a sheet in chunks of rows, every cell as a string.
+    
+    The reader is picked by extension: openpyxl's read-only iterator
+    for .xlsx/.xlsm, pyarrow (or chunked pandas) for .csv/.tsv and
+    .parquet. The first row is the header. Fully blank rows are
+    skipped. Legacy .xls files cannot be streamed by openpyxl and are
+    read through pandas in one go, then chunked the same way.
+    
+    Args:
+        filepath (str): Path to a workbook or table file
+        sheet_name (str): Sheet to read (default: the active/first
+                          sheet; ignored for CSV and Parquet)
+        chunk_size (int): Rows per chunk
+        columns (list): Only read these columns, kept in file order
+                        (default: all)
+    
+    Yields:
+        pd.DataFrame: Chunks of object-dtype text columns
+    """
+    suffix = _suffix(filepath)
+    if suffix in DELIMITED_SUFFIXES:
+        yield from _iter_delimited_chunks(filepath, DELIMITED_SUFFIXES[suffix], chunk_size, columns)
+        return
+    if suffix in PARQUET_SUFFIXES:
+        yield from _iter_parquet_chunks(filepath, chunk_size, columns)
+        return
+    
+    if suffix == '.xls':
+        frame = text_frame(pd.read_excel(filepath, sheet_name=sheet_name or 0, usecols=columns))
+        for start in range(0, max(len(frame), 1), chunk_size):
+            yield _drop_blank_rows(frame.iloc[start:start + chunk_size])
+        return
+    
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        
+        header = next(rows, None)
+        if header is None:
+            yield pd.DataFrame()
+            return
+        names = header_names(header)
+        if columns is None:
+            keep = list(range(len(names)))
+        else:
+            wanted = set(columns)
+            keep = [index for index, name in enumerate(names) if name in wanted]
+        names = [names[index] for index in keep]
+        width = len(header)
+        
+        chunk = []
+        start = 0
+        for values in rows:
+            if len(values) < width:
+                values = tuple(values) + (None,) * (width - len(values))
+            row = [cell_text(values[index]) for index in keep]
+            if not any(row):
+                continue
+            
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield _frame(chunk, names, start)
+                start += len(chunk)
+                chunk = []
+        
+        if chunk or not start:
+            yield _frame(chunk, names, start)
+    finally:
+        workbook.close()
+
+
+def read_workbook(filepath, sheet_name=None, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """
+    Read a whole sheet into one DataFrame of strings.
+    
+    Args:
+        filepath (str): Path to a workbook or table file
+        sheet_name (str): Sheet to read (default: the active/first sheet)
+        chunk_size (int): Rows read per step
+        columns (list): Only read these columns (default: all)
+    
+    Returns:
+        pd.DataFrame: Object-dtype text columns
+    """
+    return pd.concat(iter_workbook_chunks(filepath, sheet_name, chunk_size, columns))
+
+
+def read_sheets(filepath, sheets=None, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """
+    Read several sheets into one DataFrame with a leading 'Sheet' column.
+    
+    The sheet name becomes the first path level, so every sheet ends up
+    under its own sub-root. Columns are matched by name; a column that
+    only some sheets have is blank in the others.
+    
+    Args:
+        filepath (str): Path to a workbook or table file
+        sheets (list): Sheet names to read (default: all)
+        chunk_size (int): Rows read per step
+        columns (list): Only read these columns (default: all)
+    
+    Returns:
+        pd.DataFrame: Object-dtype text columns
+    """
+    frames = []
+    for sheet in sheets or sheet_names(filepath):
+        frame = read_workbook(filepath, sheet, chunk_size, columns)
+        if frame.columns.empty:
+            continue
+        frame.insert(0, 'Sheet', sheet, allow_duplicates=True)
+        frames.append(frame)
+    
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).fillna('')